@@ -1,13 +1,30 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyArrowPatch
-from graphviz import Digraph
-import tempfile
 import os
-import streamlit.components.v1 as components
+
+from ingest import (
+    CRITERIA,
+    EdgeListGraph,
+    matrices_to_graphs,
+    read_edge_list,
+    read_excel_matrices,
+    read_excel_spreads,
+    read_matrix_csv,
+    read_matrix_files,
+    read_matrix_parquet,
+)
+from contingency import contingency_analysis, critical_lanes
+from hub_labels import dense_to_csr, dijkstra_route, graph_fingerprint, index_path, load_or_build
+from landmarks import LandmarkIndex, approximation_error
+from nearest import nearest_table, read_targets
+from pathfinding import combine_weights, compute_path_totals, reconstruct_path
+from pruning import prune_dominated
+from robustness import ROBUSTNESS_MAX_NODES, monte_carlo_robustness, robustness_table
+from usage import route_usage, usage_tables
+from scc import condense, solve_by_components
+from snapshots import read_snapshot_files, read_snapshot_workbook, route_history, solve_parallel, solve_warm
+from solvers import SOLVERS, get_solver, load_calibration, pick_solver
 
 # -----------------------------------------------------------
 # PAGE CONFIG + GLOBAL UI THEME
@@ -20,499 +37,34 @@ st.set_page_config(
 )
 
 # Global CSS (Design + Animations)
-st.markdown("""
-<style>
-/* ---------- ROOT VARIABLES ---------- */
-:root {
-    --light-bg: #f8f9fa;
-    --card-bg: #ffffff;
-    --text-primary: #2c3e50;
-    --text-secondary: #5d6d7e;
-    --accent-gold: #b8860b;
-    --accent-gold-dark: #8b6914;
-    --accent-gold-light: #f5e8c6;
-    --accent-gold-lighter: #f9f3e3;
-    --primary-blue: #3498db;
-    --success: #27ae60;
-    --border: #e9ecef;
-    --shadow: rgba(0, 0, 0, 0.05);
-}
-
-/* ---------- GLOBAL STYLES ---------- */
-html, body, [class*="css"] {
-    font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, sans-serif;
-    background-color: var(--light-bg);
-    color: var(--text-primary);
-    scroll-behavior: smooth;
-}
-
-.stApp {
-    background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-    animation: gradientBG 20s ease infinite;
-    background-size: 400% 400%;
-}
-
-/* ---------- ANIMATIONS ---------- */
-@keyframes fadeIn {
-    0% { opacity: 0; transform: translateY(10px); }
-    100% { opacity: 1; transform: translateY(0); }
-}
-
-@keyframes slideInLeft {
-    0% { opacity: 0; transform: translateX(-20px); }
-    100% { opacity: 1; transform: translateX(0); }
-}
-
-@keyframes slideInRight {
-    0% { opacity: 0; transform: translateX(20px); }
-    100% { opacity: 1; transform: translateX(0); }
-}
-
-@keyframes gradientBG {
-    0% { background-position: 0% 50%; }
-    50% { background-position: 100% 50%; }
-    100% { background-position: 0% 50%; }
-}
-
-/* ---------- HEADERS WITH GOLD ACCENT ---------- */
-h1 {
-    font-weight: 800 !important;
-    color: var(--accent-gold-dark) !important;
-    letter-spacing: -0.5px;
-    padding-bottom: 15px;
-    margin-bottom: 30px;
-    border-bottom: 3px solid var(--accent-gold);
-    animation: slideInLeft 0.8s cubic-bezier(0.4, 0, 0.2, 1);
-    background: linear-gradient(90deg, var(--accent-gold), transparent);
-    background-size: 100% 3px;
-    background-position: bottom left;
-    background-repeat: no-repeat;
-}
-
-h2, h3, h4, h5, h6 {
-    color: var(--accent-gold-dark) !important;
-    font-weight: 700 !important;
-    animation: fadeIn 0.6s ease-out;
-}
-
-/* ---------- TEXT ELEMENTS ---------- */
-p, li, span, div {
-    color: var(--text-primary) !important;
-}
-
-/* ---------- SECTION TITLES ---------- */
-.section-title {
-    font-size: 1.4rem;
-    font-weight: 700;
-    margin: 35px 0 20px 0;
-    color: var(--accent-gold-dark) !important;
-    padding-left: 16px;
-    border-left: 4px solid var(--accent-gold);
-    animation: slideInLeft 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-    background: linear-gradient(90deg, rgba(184, 134, 11, 0.05) 0%, transparent 100%);
-    padding: 12px 20px;
-    border-radius: 0 10px 10px 0;
-    letter-spacing: -0.3px;
-}
-
-/* ---------- ENHANCED CARD DESIGN ---------- */
-.card {
-    padding: 25px;
-    background: var(--card-bg);
-    border-radius: 16px;
-    box-shadow: 
-        0 3px 12px var(--shadow),
-        inset 0 1px 0 rgba(255, 255, 255, 0.7);
-    animation: fadeIn 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    border: 1px solid rgba(184, 134, 11, 0.08);
-    margin-bottom: 20px;
-}
-
-.card:hover {
-    transform: translateY(-2px);
-    box-shadow: 
-        0 6px 20px rgba(184, 134, 11, 0.08),
-        inset 0 1px 0 rgba(255, 255, 255, 0.7);
-}
-
-/* ---------- BUTTON DESIGN ---------- */
-.stButton button {
-    background: linear-gradient(135deg, var(--accent-gold) 0%, var(--accent-gold-dark) 100%);
-    color: white !important;
-    border: none;
-    padding: 12px 28px;
-    font-weight: 600;
-    font-size: 0.95rem;
-    border-radius: 10px;
-    cursor: pointer;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    box-shadow: 0 4px 12px rgba(184, 134, 11, 0.2);
-}
-
-.stButton button:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 6px 16px rgba(184, 134, 11, 0.3);
-}
-
-
-
-
-
-/* ---------- UPLOADER STYLING WITH WHITE TEXT ---------- */
-.stFileUploader {
-    animation: slideInRight 0.6s ease;
-}
-
-.stFileUploader > div {
-    border: 2px dashed rgba(184, 134, 11, 0.3) !important;
-    border-radius: 12px !important;
-    background: linear-gradient(135deg, rgba(184, 134, 11, 0.1) 0%, rgba(139, 105, 20, 0.1) 100%) !important;
-    transition: all 0.3s ease !important;
-}
-
-/* Target the "Drag and drop file here" text specifically */
-.stFileUploader > div > div > div > div > div > div > div {
-    color: white !important;
-    font-weight: 500 !important;
-}
-
-.stFileUploader > div:hover {
-    border-color: var(--accent-gold) !important;
-    background: linear-gradient(135deg, rgba(184, 134, 11, 0.15) 0%, rgba(139, 105, 20, 0.15) 100%) !important;
-}
-
-/* Also target the browse files button text */
-.stFileUploader button {
-    color: white !important;
-    background: var(--accent-gold) !important;
-    border-radius: 8px !important;
-}
-
-.stFileUploader button:hover {
-    background: var(--accent-gold-dark) !important;
-}
-
-/* ---------- DATA FRAME STYLING ---------- */
-/* Light background for tables */
-.dataframe {
-    border-radius: 10px !important;
-    overflow: hidden !important;
-    border: 1px solid rgba(184, 134, 11, 0.2) !important;
-    animation: fadeIn 0.6s ease !important;
-    background-color: var(--accent-gold-lighter) !important;
-}
-
-/* Gold bold headers */
-.dataframe th {
-    background: linear-gradient(135deg, var(--accent-gold) 0%, var(--accent-gold-dark) 100%) !important;
-    color: white !important;
-    font-weight: 700 !important;
-    border: none !important;
-    padding: 12px 15px !important;
-    text-align: center !important;
-}
-
-/* Table cells */
-.dataframe td {
-    border: 1px solid rgba(184, 134, 11, 0.1) !important;
-    padding: 10px 15px !important;
-    color: var(--text-primary) !important;
-    background-color: var(--accent-gold-lighter) !important;
-}
-
-/* Remove default borders */
-.dataframe tbody tr {
-    border-bottom: 1px solid rgba(184, 134, 11, 0.1) !important;
-}
-
-/* Hover effect */
-.dataframe tbody tr:hover {
-    background-color: rgba(184, 134, 11, 0.1) !important;
-}
-
-/* ---------- GRADIENT TABLE CELLS ---------- */
-.gradient-low {
-    background: linear-gradient(135deg, #f9f3e3 0%, #f5e8c6 100%) !important;
-    color: var(--text-primary) !important;
-    font-weight: 500 !important;
-}
-
-.gradient-medium {
-    background: linear-gradient(135deg, #f0dcaf 0%, #e8cf9a 100%) !important;
-    color: var(--text-primary) !important;
-    font-weight: 500 !important;
-}
-
-.gradient-high {
-    background: linear-gradient(135deg, #e8c87a 0%, #dbb85c 100%) !important;
-    color: var(--text-primary) !important;
-    font-weight: 500 !important;
-}
-
-.gradient-very-high {
-    background: linear-gradient(135deg, #dbb85c 0%, #b8860b 100%) !important;
-    color: white !important;
-    font-weight: 600 !important;
-}
-
-/* ---------- GRAPH CONTAINER - CENTERED ---------- */
-.graph-container {
-    border-radius: 16px;
-    background: var(--card-bg);
-    padding: 20px;
-    box-shadow:
-        0 3px 12px var(--shadow),
-        inset 0 1px 0 rgba(255, 255, 255, 0.7);
-    animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1);
-    border: 1px solid var(--border);
-
-    /* NEW important scaling rules */
-    max-width: 850px;   /* controls graph size */
-    width: 100%;        /* responsive */
-    margin: 0 auto;     /* center */
-    text-align: center; /* center contents */
-}
-
-/* Scale PNG inside container */
-.graph-container img {
-    width: 100% !important;
-    height: auto !important;
-    object-fit: contain !important;
-}
-
-/* TIME WEIGHT slider */
-div[data-testid="stSlider"] label:has(span:contains("Time Weight")) ~ div input[type="range"]::-webkit-slider-runnable-track {
-    background: #0A3D62 !important;
-}
-div[data-testid="stSlider"] label:has(span:contains("Time Weight")) ~ div input[type="range"]::-webkit-slider-thumb {
-    background: #074273 !important;
-    border: 2px solid #0A3D62 !important;
-}
-
-/* COST WEIGHT slider */
-div[data-testid="stSlider"] label:has(span:contains("Cost Weight")) ~ div input[type="range"]::-webkit-slider-runnable-track {
-    background: #0A3D62 !important;
-}
-div[data-testid="stSlider"] label:has(span:contains("Cost Weight")) ~ div input[type="range"]::-webkit-slider-thumb {
-    background: #074273 !important;
-    border: 2px solid #0A3D62 !important;
-}
-
-/* RISK WEIGHT slider */
-div[data-testid="stSlider"] label:has(span:contains("Risk Weight")) ~ div input[type="range"]::-webkit-slider-runnable-track {
-    background: #0A3D62 !important;
-}
-div[data-testid="stSlider"] label:has(span:contains("Risk Weight")) ~ div input[type="range"]::-webkit-slider-thumb {
-    background: #074273 !important;
-    border: 2px solid #0A3D62 !important;
-}
-
-
-/* ---------- ALERT MESSAGES ---------- */
-.stAlert {
-    border-radius: 10px !important;
-    border-left: 4px solid !important;
-    animation: slideInRight 0.4s ease !important;
-    background: rgba(255, 255, 255, 0.95) !important;
-    border: 1px solid rgba(0, 0, 0, 0.1) !important;
-}
-
-.stSuccess {
-    border-left-color: var(--success) !important;
-    color: #155724 !important;
-}
-
-.stError {
-    border-left-color: #e74c3c !important;
-    color: #721c24 !important;
-}
-
-/* ---------- WEIGHT DISPLAY ---------- */
-.weight-display {
-    display: flex;
-    justify-content: space-between;
-    margin: 20px 0;
-    padding: 15px;
-    background: linear-gradient(135deg, rgba(184, 134, 11, 0.05) 0%, rgba(139, 105, 20, 0.05) 100%);
-    border-radius: 10px;
-    animation: fadeIn 0.6s ease;
-    border: 1px solid rgba(184, 134, 11, 0.1);
-}
-
-.weight-item {
-    text-align: center;
-    padding: 10px;
-    flex: 1;
-}
-
-.weight-value {
-    font-size: 1.3rem;
-    font-weight: 700;
-    color: var(--accent-gold-dark);
-    margin-bottom: 5px;
-}
-
-.weight-label {
-    font-size: 0.85rem;
-    color: var(--text-secondary);
-    font-weight: 500;
-    text-transform: uppercase;
-    letter-spacing: 0.5px;
-}
-
-/* ---------- METRIC CARDS ---------- */
-.metric-card {
-    padding: 15px;
-    background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-    border-radius: 10px;
-    border-left: 4px solid var(--accent-gold);
-    animation: fadeIn 0.5s ease;
-    transition: all 0.3s ease;
-    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.04);
-}
-
-.metric-card:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-}
-
-.metric-value {
-    font-size: 1.5rem;
-    font-weight: 700;
-    color: var(--accent-gold-dark);
-    margin-bottom: 5px;
-}
-
-.metric-label {
-    font-size: 0.85rem;
-    color: var(--text-secondary);
-    font-weight: 500;
-}
-
-/* ---------- SCROLLBAR STYLING ---------- */
-::-webkit-scrollbar {
-    width: 6px;
-    height: 6px;
-}
-
-::-webkit-scrollbar-track {
-    background: rgba(184, 134, 11, 0.05);
-    border-radius: 3px;
-}
-
-::-webkit-scrollbar-thumb {
-    background: var(--accent-gold);
-    border-radius: 3px;
-}
-
-::-webkit-scrollbar-thumb:hover {
-    background: var(--accent-gold-dark);
-}
-
-/* ---------- REMOVE WHITE DIVS ---------- */
-div[data-testid="stVerticalBlock"] > div > div {
-    background: transparent !important;
-}
-
-/* ---------- CENTERED CONTAINER FOR GRAPH ---------- */
-.centered-container {
-    display: flex;
-    justify-content: center;
-    align-items: center;
-    width: 100%;
-}
-
-
-
-/* ---------- BUTTON TEXT WHITE ---------- */
-.stButton button, .stButton button span, .stButton button p {
-    color: white !important;
-}
-
-
-
-</style>
-""", unsafe_allow_html=True)
-
-
-# -----------------------------------------------------------
-# UTIL: shorten edges (unchanged)
-# -----------------------------------------------------------
-def shorten_edge(pos_u, pos_v, node_radius=0.08):
-    x1, y1 = pos_u
-    x2, y2 = pos_v
-    dx = x2 - x1
-    dy = y2 - y1
-    dist = np.sqrt(dx * dx + dy * dy)
-
-    if dist == 0:
-        return x2, y2
-
-    ratio = (dist - node_radius) / dist
-    return x1 + dx * ratio, y1 + dy * ratio
-
+# With static serving on, the browser fetches and caches the stylesheet once;
+# otherwise the file is read once per process and inlined.
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css")
 
-# -----------------------------------------------------------
-# FLOYD–WARSHALL WITH PATH RECONSTRUCTION
-# -----------------------------------------------------------
-def floydWarshall_with_path(graph):
-    V = len(graph)
-    next_node = [[None] * V for _ in range(V)]
 
-    for i in range(V):
-        for j in range(V):
-            if graph[i][j] != 9999 and i != j:
-                next_node[i][j] = j
+@st.cache_resource
+def load_css():
+    with open(STYLE_PATH) as f:
+        return f"<style>\n{f.read()}</style>"
 
-    for k in range(V):
-        for i in range(V):
-            for j in range(V):
-                if graph[i][k] + graph[k][j] < graph[i][j]:
-                    graph[i][j] = graph[i][k] + graph[k][j]
-                    next_node[i][j] = next_node[i][k]
 
-    return graph, next_node
-
-
-def reconstruct_path(i, j, next_node):
-    if next_node[i][j] is None:
-        return None
-    path = [i]
-    while i != j:
-        i = next_node[i][j]
-        path.append(i)
-    return path
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<link rel="stylesheet" href="app/static/style.css">', unsafe_allow_html=True)
+else:
+    st.markdown(load_css(), unsafe_allow_html=True)
 
 
 # -----------------------------------------------------------
-# PATH TOTALS (Weighted + Time + Cost + Risk)
+# GRAPHVIZ VISUALIZATION
 # -----------------------------------------------------------
-def compute_path_totals(path, orig_time, orig_cost, orig_risk,
-                        w_time, w_cost, w_risk):
-    total_time = total_cost = total_risk = total_weighted = 0
-
-    for k in range(len(path) - 1):
-        i = path[k]
-        j = path[k + 1]
+def heat_color(x):
+    """Pale gold (x=0) → deep red (x=1) as a Graphviz hex colour."""
+    low, high = (245, 232, 198), (178, 34, 34)
+    r, g, b = (round(l + (h - l) * x) for l, h in zip(low, high))
+    return f"#{r:02x}{g:02x}{b:02x}"
 
-        t = orig_time[i][j] if orig_time[i][j] != 9999 else 0
-        c = orig_cost[i][j] if orig_cost[i][j] != 9999 else 0
-        r = orig_risk[i][j] if orig_risk[i][j] != 9999 else 0
 
-        total_time += t
-        total_cost += c
-        total_risk += r
-        total_weighted += w_time * t + w_cost * c + w_risk * r
-
-    return total_weighted, total_time, total_cost, total_risk
-
-
-# -----------------------------------------------------------
-# GRAPHVIZ VISUALIZATION
-# -----------------------------------------------------------
-def visualize_graph(graph, node_labels, title="Graph"):
-    import re
+def visualize_graph(graph, node_labels, title="Graph", edge_heat=None, node_heat=None):
     import tempfile
     import os
     from graphviz import Digraph
@@ -529,6 +81,12 @@ def visualize_graph(graph, node_labels, title="Graph"):
     V = len(graph)
     node_colors = {str(i): dark_pastels[i % len(dark_pastels)] for i in range(V)}
 
+    # Optional usage overlay: colour/width by share of the busiest lane or hub
+    if node_heat is not None:
+        peak = max(node_heat.max(), 1)
+        node_colors = {str(i): heat_color(node_heat[i] / peak) for i in range(V)}
+    edge_peak = max(edge_heat.max(), 1) if edge_heat is not None else None
+
     # -------------------------------------------------------------------
     # BUILD GRAPHVIZ GRAPH
     # -------------------------------------------------------------------
@@ -560,6 +118,19 @@ def visualize_graph(graph, node_labels, title="Graph"):
     for i in range(V):
         for j in range(V):
             if i != j and graph[i][j] != 9999:
+                if edge_heat is not None:
+                    heat = edge_heat[i][j] / edge_peak
+                    dot.edge(
+                        str(i), str(j),
+                        label=str(int(edge_heat[i][j])),
+                        color=heat_color(heat),
+                        fontcolor=heat_color(heat),
+                        penwidth=str(round(1 + 4 * heat, 2)),
+                        arrowsize="0.9",
+                        fontsize="12"
+                    )
+                    continue
+
                 dot.edge(
                     str(i), str(j),
                     label=str(round(graph[i][j], 2)),
@@ -589,6 +160,112 @@ def visualize_graph(graph, node_labels, title="Graph"):
 
 
 
+def combined_csr(edge_graph, graphs, weights):
+    """Sparse weighted combined graph, straight from the edge list when there is one."""
+    if edge_graph is not None:
+        return edge_graph.combined_csr(*weights)
+    return dense_to_csr(combine_weights(*graphs, *weights))
+
+
+@st.cache_resource(show_spinner="Preparing route index...", max_entries=4)
+def cached_route_index(fingerprint, _csr):
+    # Keyed by the combined graph fingerprint; the index is also persisted to disk
+    return load_or_build(_csr)[0]
+
+
+def show_route_lookup(build_csr, node_labels, path_totals):
+    """Origin → destination lookup: saved hub-label index, else one Dijkstra per query.
+
+    ``build_csr`` makes the combined graph only once the lookup is enabled;
+    ``path_totals(path)`` returns (score, time, cost, risk) for a route.
+    """
+    if not st.checkbox("Enable route lookup", value=False,
+                       help="Routes come from 2-hop hub labels once an index is built for this "
+                            "workbook and weight setting; until then each query runs one Dijkstra"):
+        return
+
+    csr = build_csr()
+    fingerprint = graph_fingerprint(csr)
+
+    # Moving a weight slider changes the graph; build only on request
+    route_index = None
+    if os.path.exists(index_path(fingerprint)):
+        route_index = cached_route_index(fingerprint, csr)
+    elif st.button("Build Route Index", key="build_index",
+                   help="Slow on large networks without dominant hubs; the index is saved to disk"):
+        route_index = cached_route_index(fingerprint, csr)
+
+    if route_index is not None:
+        st.caption(f"{route_index.n_entries} label entries for {csr.nnz} lanes")
+    else:
+        st.caption("No index saved for these weights yet; each query runs one Dijkstra.")
+
+    V = len(node_labels)
+    col1, col2 = st.columns(2)
+    with col1:
+        src = st.selectbox("From", range(V), format_func=lambda v: node_labels[v])
+    with col2:
+        dst = st.selectbox("To", range(V), index=min(1, V - 1), format_func=lambda v: node_labels[v])
+
+    path = route_index.route(src, dst) if route_index is not None else dijkstra_route(csr, src, dst)
+    if path is None:
+        st.warning("NO PATH")
+    else:
+        total_w, total_t, total_c, total_r = path_totals(path)
+        st.markdown(f"**{' → '.join(node_labels[p] for p in path)}**")
+        st.caption(
+            f"Score {total_w:.2f} • Time {total_t:.2f} • "
+            f"Cost {total_c:.2f} • Risk {total_r:.2f}"
+        )
+
+
+@st.cache_resource(show_spinner="Solving from landmarks...")
+def cached_landmark_index(fingerprint, n_landmarks, method, _csr):
+    return LandmarkIndex.build(_csr, n_landmarks, method)
+
+
+def show_landmark_estimates(csr, node_labels):
+    """Landmark controls, a bounded pair lookup and the sampled error report."""
+    col1, col2 = st.columns(2)
+    with col1:
+        n_landmarks = st.slider("Landmarks", 1, 64, 16, 1,
+                                help="More landmarks tighten the bounds; memory grows as 2·L·V floats")
+    with col2:
+        method = st.selectbox("Landmark Selection", ["degree", "random"], format_func=str.capitalize)
+
+    index = cached_landmark_index(graph_fingerprint(csr), n_landmarks, method, csr)
+    st.caption(f"{len(index.landmarks)} landmarks • {index.nbytes / 1e6:.1f} MB of distances")
+
+    V = len(node_labels)
+    col1, col2 = st.columns(2)
+    with col1:
+        src = st.selectbox("From", range(V), key="landmark_from", format_func=lambda v: node_labels[v])
+    with col2:
+        dst = st.selectbox("To", range(V), index=min(1, V - 1), key="landmark_to",
+                           format_func=lambda v: node_labels[v])
+
+    lower, upper = (float(b[0]) for b in index.bounds([src], [dst]))
+    if not np.isfinite(lower):
+        st.warning("NO PATH")
+    elif not np.isfinite(upper):
+        st.markdown(f"**Score ≥ {lower:.2f}** (no landmark route connects this pair)")
+    else:
+        st.markdown(f"**Score between {lower:.2f} and {upper:.2f}**")
+
+    n_pairs = st.number_input("Sample Pairs", 50, 5000, 200, 50,
+                              help="Pairs checked against exact Dijkstra distances")
+    if st.button("Measure Approximation Error", key="run_landmark_error"):
+        with st.spinner("Solving sampled pairs exactly..."):
+            report = approximation_error(index, csr, n_pairs)
+        st.dataframe(pd.DataFrame([report]).round(4), use_container_width=True)
+
+
+# Networks above this size stay sparse and skip the exact solvers. The
+# dense path keeps about eight V×V float arrays (~250 MB at 2000 nodes) and
+# the fastest backends finish an all-pairs solve there in a few seconds.
+DENSE_NODE_LIMIT = 2000
+
+
 # -----------------------------------------------------------
 # UI LAYOUT
 # -----------------------------------------------------------
@@ -600,43 +277,91 @@ st.markdown("""
 <p style='color: var(--text-primary); line-height: 1.6; margin-bottom: 0;'>
 Upload an Excel file with 3 sheets: <strong>Time</strong>, <strong>Cost</strong>, <strong>Risk</strong>.
 Each sheet must contain a square adjacency matrix with identical node names.
+For large networks, upload one matrix CSV/Parquet file per criterion, or a single
+edge list with columns <strong>from, to, time, cost, risk</strong>.
 </p>
 </div>
 """, unsafe_allow_html=True)
 
-# -----------------------------------------------------------
-# FILE UPLOAD
-# -----------------------------------------------------------
 # -----------------------------------------------------------
 # FILE UPLOAD + DEFAULT BUTTON (PERSISTENT)
 # -----------------------------------------------------------
+INPUT_FORMATS = {
+    "Excel Workbook": "excel",
+    "Matrix CSV (one file per criterion)": "csv",
+    "Matrix Parquet (one file per criterion)": "parquet",
+    "Edge List (CSV or Parquet)": "edges",
+}
+
 if "input_file" not in st.session_state:
     st.session_state.input_file = None
+    st.session_state.input_kind = None
 
-uploaded_file = st.file_uploader(
-    "Upload Excel File",
-    type=["xlsx"],
-    help="Upload your Excel file with Time, Cost, and Risk sheets"
+input_format = st.radio(
+    "Input Format",
+    list(INPUT_FORMATS),
+    horizontal=True,
+    help="Excel is simplest; CSV, Parquet and edge lists are read in chunks for large networks"
 )
-
-use_default = st.button("Use Default File")
-
-# If user uploads a file
-if uploaded_file is not None:
-    st.session_state.input_file = uploaded_file
-    st.success("Custom file loaded successfully.")
-
-# If user clicks "Use Default"
-elif use_default:
-    default_path = os.path.join(os.path.dirname(__file__), "GoldMatrices.xlsx")
-    if os.path.exists(default_path):
-        st.session_state.input_file = default_path
-        st.success("Default matrix file loaded successfully.")
-    else:
-        st.error("Default file 'GoldMatrices.xlsx' was not found.")
+input_kind = INPUT_FORMATS[input_format]
+
+if input_kind == "excel":
+    uploaded_file = st.file_uploader(
+        "Upload Excel File",
+        type=["xlsx"],
+        help="Upload your Excel file with Time, Cost, and Risk sheets"
+    )
+
+    use_default = st.button("Use Default File")
+
+    # If user uploads a file
+    if uploaded_file is not None:
+        st.session_state.input_file = uploaded_file
+        st.session_state.input_kind = input_kind
+        st.success("Custom file loaded successfully.")
+
+    # If user clicks "Use Default"
+    elif use_default:
+        default_path = os.path.join(os.path.dirname(__file__), "GoldMatrices.xlsx")
+        if os.path.exists(default_path):
+            st.session_state.input_file = default_path
+            st.session_state.input_kind = input_kind
+            st.success("Default matrix file loaded successfully.")
+        else:
+            st.error("Default file 'GoldMatrices.xlsx' was not found.")
+
+elif input_kind in ("csv", "parquet"):
+    upload_cols = st.columns(3)
+    matrix_files = []
+    for col, criterion in zip(upload_cols, CRITERIA):
+        with col:
+            matrix_files.append(st.file_uploader(
+                f"{criterion} Matrix",
+                type=[input_kind],
+                key=f"{input_kind}_{criterion}",
+                help=f"Square {criterion.lower()} matrix, node names in the first column and header"
+            ))
+
+    if all(f is not None for f in matrix_files):
+        st.session_state.input_file = tuple(matrix_files)
+        st.session_state.input_kind = input_kind
+        st.success("Custom files loaded successfully.")
+
+else:
+    uploaded_file = st.file_uploader(
+        "Upload Edge List",
+        type=["csv", "parquet"],
+        help="One row per lane with columns: from, to, time, cost, risk"
+    )
+
+    if uploaded_file is not None:
+        st.session_state.input_file = uploaded_file
+        st.session_state.input_kind = input_kind
+        st.success("Custom file loaded successfully.")
 
 # Final file reference
 file = st.session_state.input_file
+file_kind = st.session_state.input_kind
 
 if not file:
     st.stop()
@@ -644,42 +369,53 @@ if not file:
 if file:
     st.markdown("<div class='section-title'>Matrix Validation</div>", unsafe_allow_html=True)
 
+    # Edge lists go straight to numpy arrays; no dense DataFrames are built.
+    spread_graphs = None
+    edge_graph = None
+    target_groups = {}
     try:
-        time_df = pd.read_excel(file, sheet_name="Time", index_col=0)
-        cost_df = pd.read_excel(file, sheet_name="Cost", index_col=0)
-        risk_df = pd.read_excel(file, sheet_name="Risk", index_col=0)
-    except:
-        st.error("File must contain sheets: Time, Cost, Risk.")
-        st.stop()
-
-    # Validate
-    if time_df.shape[0] != time_df.shape[1]:
-        st.error("Time matrix is not square.");
-        st.stop()
-    if cost_df.shape[0] != cost_df.shape[1]:
-        st.error("Cost matrix is not square.");
-        st.stop()
-    if risk_df.shape[0] != risk_df.shape[1]:
-        st.error("Risk matrix is not square.");
+        if file_kind == "edges":
+            edge_graph = read_edge_list(file)
+            node_labels = edge_graph.labels
+            if len(node_labels) <= DENSE_NODE_LIMIT:
+                time_graph, cost_graph, risk_graph = edge_graph.to_dense()
+        else:
+            if file_kind == "excel":
+                matrix_dfs = read_excel_matrices(file)
+            elif file_kind == "csv":
+                matrix_dfs = read_matrix_files(*file, reader=read_matrix_csv)
+            else:
+                matrix_dfs = read_matrix_files(*file, reader=read_matrix_parquet)
+
+            node_labels = list(matrix_dfs[0].index)
+            time_graph, cost_graph, risk_graph = matrices_to_graphs(*matrix_dfs)
+            del matrix_dfs
+
+            # Too large for the all-pairs solvers: continue with the lanes only
+            if len(node_labels) > DENSE_NODE_LIMIT:
+                edge_graph = EdgeListGraph.from_dense(node_labels, time_graph, cost_graph, risk_graph)
+                del time_graph, cost_graph, risk_graph
+
+            if file_kind == "excel":
+                spread_graphs = read_excel_spreads(file, node_labels)
+    except ValueError as e:
+        st.error(str(e))
         st.stop()
 
-    if not (list(time_df.index) == list(cost_df.index) == list(risk_df.index)):
-        st.error("Sheet node labels do not match.");
-        st.stop()
+    # A bad optional Targets sheet only disables the Nearest Hub defaults
+    target_error = None
+    if file_kind == "excel":
+        try:
+            target_groups = read_targets(file, node_labels)
+        except ValueError as e:
+            target_error = str(e)
 
-    node_labels = list(time_df.index)
     V = len(node_labels)
 
-    st.success(f"**{V} nodes loaded successfully:** {', '.join(node_labels)}")
-
-    # Matrix prep
-    time_graph = np.nan_to_num(time_df.to_numpy(), nan=9999)
-    cost_graph = np.nan_to_num(cost_df.to_numpy(), nan=9999)
-    risk_graph = np.nan_to_num(risk_df.to_numpy(), nan=9999)
-
-    orig_time = time_graph.copy()
-    orig_cost = cost_graph.copy()
-    orig_risk = risk_graph.copy()
+    if V > DENSE_NODE_LIMIT:
+        st.success(f"**{V} nodes and {len(edge_graph.src)} lanes loaded successfully.**")
+    else:
+        st.success(f"**{V} nodes loaded successfully:** {', '.join(map(str, node_labels))}")
 
     # -------------------------------------------------------
     # Weights
@@ -728,35 +464,87 @@ if file:
             </div>
             """, unsafe_allow_html=True)
 
+    # Very large networks: sparse lanes only, no V² matrices
+    if V > DENSE_NODE_LIMIT:
+        st.markdown("<div class='section-title'>Approximate Distances</div>", unsafe_allow_html=True)
+        st.info(f"Exact all-pairs solving is disabled above {DENSE_NODE_LIMIT} nodes; "
+                "scores are bounded from landmark distances instead.")
+        large_csr = edge_graph.combined_csr(w_time, w_cost, w_risk)
+        show_landmark_estimates(large_csr, node_labels)
+
+        st.markdown("<div class='section-title'>Route Lookup</div>", unsafe_allow_html=True)
+        with st.expander("Exact origin → destination queries"):
+            show_route_lookup(
+                lambda: large_csr,
+                node_labels,
+                lambda path: edge_graph.path_totals(path, w_time, w_cost, w_risk)
+            )
+        st.stop()
+
+    # Matrix prep
+    orig_time = time_graph.copy()
+    orig_cost = cost_graph.copy()
+    orig_risk = risk_graph.copy()
+
     # -------------------------------------------------------
     # RUN COMPUTATION
     # -------------------------------------------------------
     st.markdown("<div class='section-title'>Compute Shortest Paths</div>", unsafe_allow_html=True)
 
+    prune_lanes = st.checkbox(
+        "Prune dominated lanes",
+        value=True,
+        help="Drop direct lanes that a two-hop alternative beats on time, cost and risk; "
+             "shortest-path results are unchanged"
+    )
+
+    with st.expander("Monte-Carlo Robustness"):
+        run_robustness = st.checkbox(
+            "Sample uncertain weights after solving",
+            value=False,
+            disabled=V > ROBUSTNESS_MAX_NODES,
+            help="Re-solves the network under sampled Time/Cost/Risk values to see how often each route stays "
+                 f"optimal and how its totals vary (up to {ROBUSTNESS_MAX_NODES} nodes)"
+        ) and V <= ROBUSTNESS_MAX_NODES
+        n_samples = st.number_input("Samples", 100, 5000, 1000, 100)
+        if spread_graphs is not None:
+            st.caption("Using the Time/Cost/Risk Spread sheets as ± half-widths.")
+            spread_pct = None
+        else:
+            spread_pct = st.slider("Uncertainty (± %)", 1, 50, 10, 1) / 100
+
+    with st.expander("N-1 Lane Closure Contingency"):
+        run_contingency = st.checkbox(
+            "Rank critical lanes after solving",
+            value=False,
+            help="Closes each lane used by a chosen route and re-solves only the destinations that route over it"
+        )
+        top_lanes = st.number_input("Lanes to show", 5, 500, 25, 5)
+
+    solver_choice = st.selectbox(
+        "Solver Backend",
+        ["Auto"] + list(SOLVERS),
+        help="Auto uses the table written by `python solvers.py calibrate` on this machine"
+    )
+
     if st.button("Run Floyd-Warshall Algorithm", key="run_algo"):
 
         with st.spinner("Computing optimal paths..."):
 
+            # Lanes no weighting can route through are removed before solve + render
+            if prune_lanes:
+                time_graph, cost_graph, risk_graph, removed = prune_dominated(
+                    time_graph, cost_graph, risk_graph
+                )
+                st.info(f"Pruned {removed} Pareto-dominated lanes before solving.")
+
             # Weighted combined graph
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.markdown("#### Weighted Combined Matrix")
 
-            final_graph = np.zeros((V, V))
-
-            for i in range(V):
-                for j in range(V):
-                    if (
-                            (time_graph[i][j] == 9999 and w_time > 0) or
-                            (cost_graph[i][j] == 9999 and w_cost > 0) or
-                            (risk_graph[i][j] == 9999 and w_risk > 0)
-                    ):
-                        final_graph[i][j] = 9999
-                    else:
-                        final_graph[i][j] = (
-                                w_time * time_graph[i][j] +
-                                w_cost * cost_graph[i][j] +
-                                w_risk * risk_graph[i][j]
-                        )
+            final_graph = combine_weights(
+                time_graph, cost_graph, risk_graph, w_time, w_cost, w_risk
+            )
 
             # Display weighted matrix with gold headers
             weighted_df = pd.DataFrame(final_graph, index=node_labels, columns=node_labels)
@@ -774,9 +562,27 @@ if file:
             st.markdown("<div class='section-title'>Graph Visualization</div>", unsafe_allow_html=True)
             visualize_graph(final_graph, node_labels, "Weighted Graph")
 
-            # Floyd–Warshall
-            dist_matrix = final_graph.copy()
-            dist_matrix, next_node = floydWarshall_with_path(dist_matrix)
+            # Floyd–Warshall, split over strongly connected components
+            condensation = condense(final_graph)
+            # Auto looks up the calibration table per component, at its own size
+            backends_used = {}
+            calibration = load_calibration() or []
+
+            def select_backend(sub):
+                name = pick_solver(sub, calibration) if solver_choice == "Auto" else solver_choice
+                backends_used[name] = backends_used.get(name, 0) + 1
+                return get_solver(name)
+
+            dist_matrix, next_node = solve_by_components(
+                final_graph, condensation=condensation, select=select_backend
+            )
+
+            st.caption(
+                "Solver: " + (", ".join(f"{name} ×{n}" for name, n in backends_used.items()) or "none") + " • "
+                f"{condensation.n_components} strongly connected components "
+                f"(largest: {np.bincount(condensation.labels).max()} nodes) • "
+                f"{condensation.unreachable_pairs()} unreachable pairs skipped"
+            )
 
             # PATH OUTPUT
             st.markdown("<div class='section-title'>All Shortest Paths</div>", unsafe_allow_html=True)
@@ -923,6 +729,175 @@ if file:
                     </div>
                     """, unsafe_allow_html=True)
 
+            # LANE / HUB USAGE
+            st.markdown("<div class='section-title'>Lane & Hub Usage</div>", unsafe_allow_html=True)
+
+            edge_use, node_use = route_usage(next_node)
+            lane_usage, hub_usage = usage_tables(edge_use, node_use, node_labels)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.dataframe(lane_usage, use_container_width=True, height=300)
+            with col2:
+                st.dataframe(hub_usage, use_container_width=True, height=300)
+
+            visualize_graph(final_graph, node_labels, "Route Usage Heatmap",
+                            edge_heat=edge_use, node_heat=node_use)
+
+            # CONTINGENCY
+            if run_contingency:
+                st.markdown("<div class='section-title'>Most Critical Lanes</div>", unsafe_allow_html=True)
+
+                # Closures run on the unpruned lanes: a pruned direct lane can be
+                # the real fallback once the route that dominated it is closed
+                with st.spinner("Closing lanes one at a time..."):
+                    closures = contingency_analysis(
+                        combine_weights(orig_time, orig_cost, orig_risk, w_time, w_cost, w_risk),
+                        dist_matrix, next_node
+                    )
+
+                st.dataframe(
+                    critical_lanes(closures, next_node, node_labels, top=int(top_lanes)),
+                    use_container_width=True,
+                    height=400
+                )
+
+            # ROBUSTNESS
+            if run_robustness:
+                st.markdown("<div class='section-title'>Route Robustness</div>", unsafe_allow_html=True)
+
+                with st.spinner(f"Solving {n_samples} sampled networks..."):
+                    win_rate, percentiles = monte_carlo_robustness(
+                        (orig_time, orig_cost, orig_risk),
+                        (w_time, w_cost, w_risk),
+                        next_node,
+                        n_samples=int(n_samples),
+                        spreads=spread_graphs,
+                        pct=spread_pct
+                    )
+
+                st.dataframe(
+                    robustness_table(win_rate, percentiles, next_node, node_labels),
+                    use_container_width=True,
+                    height=400
+                )
+
+    # -------------------------------------------------------
+    # ROUTE LOOKUP (hub-label index, no V² distance matrix)
+    # -------------------------------------------------------
+    st.markdown("<div class='section-title'>Route Lookup</div>", unsafe_allow_html=True)
+
+    with st.expander("Instant origin → destination queries"):
+        show_route_lookup(
+            lambda: combined_csr(edge_graph, (orig_time, orig_cost, orig_risk), (w_time, w_cost, w_risk)),
+            node_labels,
+            lambda path: compute_path_totals(path, orig_time, orig_cost, orig_risk, w_time, w_cost, w_risk)
+        )
+
+    # -------------------------------------------------------
+    # NEAREST HUB (one multi-source Dijkstra per target set)
+    # -------------------------------------------------------
+    st.markdown("<div class='section-title'>Nearest Hub</div>", unsafe_allow_html=True)
+
+    with st.expander("Closest refinery / vault / port for every node"):
+        if target_error:
+            st.warning(f"{target_error} Pick the target nodes below instead.")
+
+        if target_groups:
+            target_type = st.selectbox("Target Type", list(target_groups))
+            default_targets = target_groups[target_type]
+        else:
+            if not target_error:
+                st.caption("Add a 'Targets' sheet (columns Node, Type) to tag hubs in the workbook.")
+            default_targets = []
+
+        target_nodes = st.multiselect(
+            "Target Nodes",
+            range(V),
+            default=default_targets,
+            format_func=lambda v: node_labels[v]
+        )
+
+        if target_nodes:
+            st.dataframe(
+                nearest_table(
+                    combined_csr(edge_graph, (orig_time, orig_cost, orig_risk), (w_time, w_cost, w_risk)),
+                    target_nodes, node_labels, orig_time, orig_cost, orig_risk,
+                    w_time, w_cost, w_risk
+                ),
+                use_container_width=True,
+                height=400
+            )
+
+    # -------------------------------------------------------
+    # APPROXIMATE DISTANCES (landmark bounds, O(L·V) memory)
+    # -------------------------------------------------------
+    st.markdown("<div class='section-title'>Approximate Distances</div>", unsafe_allow_html=True)
+
+    with st.expander("Lower / upper score bounds from landmarks"):
+        use_landmarks = st.checkbox(
+            "Enable landmark bounds",
+            value=False,
+            help="Runs one Dijkstra from and to each landmark in parallel; any pair is then bounded "
+                 "by the triangle inequality"
+        )
+
+        if use_landmarks:
+            show_landmark_estimates(
+                combined_csr(edge_graph, (orig_time, orig_cost, orig_risk), (w_time, w_cost, w_risk)),
+                node_labels
+            )
+
+    # -------------------------------------------------------
+    # SNAPSHOT TRENDS (weekly workbooks or dated sheet triples)
+    # -------------------------------------------------------
+    st.markdown("<div class='section-title'>Snapshot Trends</div>", unsafe_allow_html=True)
+
+    with st.expander("Compare a time series of workbooks"):
+        snapshot_files = st.file_uploader(
+            "Upload Snapshot Workbooks",
+            type=["xlsx"],
+            accept_multiple_files=True,
+            help="One Time/Cost/Risk workbook per snapshot, ordered by file name (e.g. 2024-03-01.xlsx). "
+                 "A single workbook may instead hold dated sheets such as 'Time 2024-03-01'."
+        )
+        snapshot_mode = st.radio(
+            "Solve Mode",
+            ["Warm start from previous snapshot", "Parallel processes"],
+            horizontal=True,
+            help="Warm starts only re-solve what changed between weeks; parallel solves every week from scratch"
+        )
+
+        if snapshot_files and st.button("Solve Snapshots", key="run_snapshots"):
+            try:
+                if len(snapshot_files) == 1:
+                    snapshot_list = read_snapshot_workbook(snapshot_files[0])
+                else:
+                    snapshot_list = read_snapshot_files(snapshot_files)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            with st.spinner(f"Solving {len(snapshot_list)} snapshots..."):
+                solve = solve_warm if snapshot_mode.startswith("Warm") else solve_parallel
+                snapshot_results, solve_notes = solve(
+                    snapshot_list, (w_time, w_cost, w_risk), solver_choice
+                )
+                history = route_history(
+                    [snap.label for snap in snapshot_list],
+                    snapshot_results,
+                    snapshot_list[0].node_labels
+                )
+
+            summary = pd.DataFrame({
+                "Snapshot": [snap.label for snap in snapshot_list],
+                "Solve": solve_notes,
+                "Changes": [int((history["Snapshot"] == snap.label).sum()) if k else 0
+                            for k, snap in enumerate(snapshot_list)],
+            })
+            st.dataframe(summary, use_container_width=True)
+            st.dataframe(history, use_container_width=True, height=400)
+
 # Footer
 st.markdown("""
 <div class='footer'>
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from parallel import pool_map, shared
+from pathfinding import NO_EDGE, as_successor_array
+from usage import route_usage
+
+# Lanes handed to a worker per task
+CONTINGENCY_BATCH = 32
+
+
+# -----------------------------------------------------------
+# WORKER (graph and baseline distances come from the pool's shared data)
+# -----------------------------------------------------------
+def _close_lanes(jobs):
+    """Close each lane and re-solve only the destinations routed over it.
+
+    Returns, per lane, the (destination, source, before, after) arrays of
+    the pairs whose score got worse.
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    V, src, dst = shared["V"], shared["src"], shared["dst"]
+    weights, dist = shared["weights"], shared["dist"]
+
+    results = []
+    for (u, v), dests in jobs:
+        keep = ~((src == u) & (dst == v))
+        reverse = csr_matrix((weights[keep], (dst[keep], src[keep])), shape=(V, V))
+        after = dijkstra(reverse, directed=True, indices=dests)
+        before = dist[:, dests].T
+
+        k, s = np.nonzero(after > before + 1e-9 * (1 + np.abs(before)))
+        results.append(((u, v), dests[k], s, before[k, s], after[k, s]))
+    return results
+
+
+# -----------------------------------------------------------
+# N-1 CONTINGENCY
+# -----------------------------------------------------------
+def contingency_analysis(final_graph, dist, next_node, max_workers=None,
+                         batch=CONTINGENCY_BATCH):
+    """Close every routed lane in turn and measure which pairs degrade.
+
+    Lane (u, v) is on the route to destination j exactly when
+    ``next_node[u, j] == v``, so closing it can only change those columns;
+    lanes no chosen route uses are skipped. Each affected column is
+    re-solved with one Dijkstra on the reversed graph, and lanes are
+    spread over a process pool in batches.
+
+    Returns a list of ``((u, v), dests, sources, before, after)``.
+    """
+    final_graph = np.asarray(final_graph, dtype=float)
+    next_node = as_successor_array(next_node)
+    V = len(final_graph)
+
+    off_diag = ~np.eye(V, dtype=bool)
+    src, dst = np.nonzero((final_graph != NO_EDGE) & off_diag)
+    weights = final_graph[src, dst]
+    base = np.where(np.asarray(dist, dtype=float) == NO_EDGE, np.inf, dist)
+
+    rows, cols = np.nonzero(next_node >= 0)
+    lanes = sorted(set(zip(rows.tolist(), next_node[rows, cols].tolist())))
+    jobs = [((u, v), np.flatnonzero(next_node[u] == v)) for u, v in lanes]
+    chunks = [jobs[k:k + batch] for k in range(0, len(jobs), batch)]
+
+    parts = pool_map(_close_lanes, chunks, max_workers=max_workers,
+                     shared_data=dict(V=V, src=src, dst=dst, weights=weights, dist=base))
+    return [r for part in parts for r in part]
+
+
+def critical_lanes(results, next_node, node_labels, top=None):
+    """Rank lanes by how much closing them degrades the network."""
+    edge_use, _ = route_usage(next_node)
+    rows = []
+    for (u, v), dests, sources, before, after in results:
+        lost = ~np.isfinite(after)
+        delta = np.where(lost, 0, after - before)
+        worst = int(np.argmax(delta)) if len(delta) else None
+
+        rows.append({
+            "From": node_labels[u],
+            "To": node_labels[v],
+            "Routes Using Lane": int(edge_use[u, v]),
+            "Pairs Degraded": int((~lost).sum()),
+            "Pairs Disconnected": int(lost.sum()),
+            "Total Score Increase": round(float(delta.sum()), 2),
+            "Worst Score Increase": round(float(delta[worst]), 2) if worst is not None else 0.0,
+            "Worst Pair": (f"{node_labels[sources[worst]]} → {node_labels[dests[worst]]}"
+                           if worst is not None and delta[worst] > 0 else None),
+        })
+
+    report = pd.DataFrame(rows, columns=[
+        "From", "To", "Routes Using Lane", "Pairs Degraded", "Pairs Disconnected",
+        "Total Score Increase", "Worst Score Increase", "Worst Pair"
+    ])
+    report = report.sort_values(
+        ["Pairs Disconnected", "Total Score Increase"], ascending=False, kind="stable"
+    ).reset_index(drop=True)
+    return report.head(top) if top is not None else report
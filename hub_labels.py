@@ -0,0 +1,243 @@
+import hashlib
+import heapq
+import os
+
+import numpy as np
+
+from pathfinding import NO_EDGE
+
+# Persisted indexes, one file per combined graph fingerprint
+INDEX_DIR = os.environ.get(
+    "GOLDPATH_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "route_index")
+)
+
+# Index files kept on disk; the least recently used are deleted first
+MAX_INDEX_FILES = int(os.environ.get("GOLDPATH_MAX_INDEX_FILES", 8))
+
+
+# -----------------------------------------------------------
+# COMBINED GRAPH → CSR
+# -----------------------------------------------------------
+def dense_to_csr(graph):
+    """CSR of the off-diagonal lanes of a combined matrix (9999 = no lane)."""
+    from scipy.sparse import csr_matrix
+
+    graph = np.asarray(graph, dtype=float)
+    lanes = graph != NO_EDGE
+    np.fill_diagonal(lanes, False)
+    src, dst = np.nonzero(lanes)
+    return csr_matrix((graph[src, dst], (src, dst)), shape=graph.shape)
+
+
+def graph_fingerprint(csr):
+    """Stable hash of the weighted lanes: changes with the workbook or weights."""
+    h = hashlib.sha1()
+    for arr in (np.array(csr.shape), csr.indptr, csr.indices, csr.data):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+# -----------------------------------------------------------
+# 2-HOP HUB LABELS (pruned landmark labeling)
+# -----------------------------------------------------------
+class HubLabelIndex:
+    """Directed 2-hop labels answering distance and route queries.
+
+    Every node v keeps an out-label {hub: (d(v, hub), next hop from v)} and an
+    in-label {hub: (d(hub, v), predecessor of v)}, stored as flat arrays with
+    per-node offsets and hubs sorted by rank. ``d(s, t)`` is the minimum of
+    ``d(s, h) + d(h, t)`` over hubs common to out(s) and in(t).
+
+    Labels are built with pruned Dijkstra searches from each node in
+    decreasing degree order: a search stops expanding a node as soon as the
+    labels built so far already give the same distance, which keeps the
+    total label size close to linear on hub-and-spoke networks. Networks
+    without dominant hubs get much larger labels (tens of entries per lane
+    on random graphs), and the pure-Python build then takes minutes.
+    """
+
+    def __init__(self, n, out_offsets, out_hubs, out_dist, out_hop,
+                 in_offsets, in_hubs, in_dist, in_hop):
+        self.n = int(n)
+        self.out_offsets, self.out_hubs = out_offsets, out_hubs
+        self.out_dist, self.out_hop = out_dist, out_hop
+        self.in_offsets, self.in_hubs = in_offsets, in_hubs
+        self.in_dist, self.in_hop = in_dist, in_hop
+
+    # ---------------- build ----------------
+    @classmethod
+    def build(cls, csr):
+        V = csr.shape[0]
+        fwd = csr.tocsr()
+        rev = csr.T.tocsr()
+        degree = np.diff(fwd.indptr) + np.diff(rev.indptr)
+        order = np.argsort(-degree, kind="stable")
+        rank = np.empty(V, dtype=np.int64)
+        rank[order] = np.arange(V)
+
+        # Labels are keyed by hub rank so sorted keys line up across nodes
+        out_lab = [dict() for _ in range(V)]
+        in_lab = [dict() for _ in range(V)]
+
+        def pruned_search(h, adj, own, covered):
+            dist = {h: 0.0}
+            hop = {h: -1}
+            heap = [(0.0, h)]
+            while heap:
+                d, v = heapq.heappop(heap)
+                if d > dist[v] or covered(v, d):
+                    continue
+                own[v][rank[h]] = (d, hop[v])
+                for k in range(adj.indptr[v], adj.indptr[v + 1]):
+                    u = adj.indices[k]
+                    nd = d + adj.data[k]
+                    if nd < dist.get(u, np.inf):
+                        dist[u] = nd
+                        hop[u] = v
+                        heapq.heappush(heap, (nd, u))
+
+        for h in order:
+            # Forward search fills in-labels d(h, v); backward fills out-labels d(v, h)
+            pruned_search(h, fwd, in_lab, lambda v, d: _covered(out_lab[h], in_lab[v], d))
+            pruned_search(h, rev, out_lab, lambda v, d: _covered(out_lab[v], in_lab[h], d))
+
+        return cls._from_dicts(V, order, out_lab, in_lab)
+
+    @classmethod
+    def _from_dicts(cls, V, order, out_lab, in_lab):
+        arrays = []
+        for labels in (out_lab, in_lab):
+            offsets = np.zeros(V + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(lab) for lab in labels])
+            hubs = np.empty(offsets[-1], dtype=np.int64)
+            dist = np.empty(offsets[-1])
+            hop = np.empty(offsets[-1], dtype=np.int64)
+            for v, lab in enumerate(labels):
+                keys = sorted(lab)
+                a, b = offsets[v], offsets[v + 1]
+                hubs[a:b] = order[keys] if keys else []
+                dist[a:b] = [lab[k][0] for k in keys]
+                hop[a:b] = [lab[k][1] for k in keys]
+            arrays += [offsets, hubs, dist, hop]
+        return cls(V, *arrays)
+
+    # ---------------- persistence ----------------
+    FIELDS = ("out_offsets", "out_hubs", "out_dist", "out_hop",
+              "in_offsets", "in_hubs", "in_dist", "in_hop")
+
+    def save(self, path):
+        np.savez(path, n=self.n, **{f: getattr(self, f) for f in self.FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(int(data["n"]), *(data[f] for f in cls.FIELDS))
+
+    @property
+    def n_entries(self):
+        return len(self.out_hubs) + len(self.in_hubs)
+
+    # ---------------- queries ----------------
+    def _best_hub(self, s, t):
+        a0, a1 = self.out_offsets[s], self.out_offsets[s + 1]
+        b0, b1 = self.in_offsets[t], self.in_offsets[t + 1]
+        _, ia, ib = np.intersect1d(self.out_hubs[a0:a1], self.in_hubs[b0:b1],
+                                   assume_unique=True, return_indices=True)
+        if not len(ia):
+            return np.inf, -1, -1, -1
+        total = self.out_dist[a0 + ia] + self.in_dist[b0 + ib]
+        k = int(np.argmin(total))
+        return float(total[k]), int(self.out_hubs[a0 + ia[k]]), a0 + ia[k], b0 + ib[k]
+
+    def distance(self, s, t):
+        """Shortest combined distance s → t (inf when unreachable)."""
+        if s == t:
+            return 0.0
+        return self._best_hub(s, t)[0]
+
+    def route(self, s, t):
+        """Node list of a shortest route s → t, or None when unreachable.
+
+        Walks from both ends: when the best hub is not s, step forward along
+        s's out-label; otherwise step t back along its in-label. Every step
+        stays on a shortest route, so at most one label query per hop.
+        """
+        head, tail = [s], []
+        for _ in range(2 * self.n):
+            if s == t:
+                return head + tail[::-1]
+            d, hub, ka, kb = self._best_hub(s, t)
+            if not np.isfinite(d):
+                return None
+            if hub != s:
+                s = int(self.out_hop[ka])
+                head.append(s)
+            else:
+                tail.append(t)
+                t = int(self.in_hop[kb])
+        return None
+
+
+def dijkstra_route(csr, s, t):
+    """Shortest route s → t with one Dijkstra, for graphs without a saved index."""
+    from scipy.sparse.csgraph import dijkstra
+
+    dist, pred = dijkstra(csr, directed=True, indices=s, return_predecessors=True)
+    if not np.isfinite(dist[t]):
+        return None
+    path = [t]
+    while path[-1] != s:
+        path.append(int(pred[path[-1]]))
+    return path[::-1]
+
+
+def _covered(out_labels, in_labels, d):
+    """True when existing labels already prove a distance ≤ d."""
+    smaller = out_labels if len(out_labels) <= len(in_labels) else in_labels
+    for h in smaller:
+        if h in out_labels and h in in_labels and out_labels[h][0] + in_labels[h][0] <= d:
+            return True
+    return False
+
+
+# -----------------------------------------------------------
+# CACHED BUILD
+# -----------------------------------------------------------
+def index_path(fingerprint, directory=INDEX_DIR):
+    return os.path.join(directory, fingerprint + ".npz")
+
+
+def evict_old_indexes(directory=INDEX_DIR, keep=MAX_INDEX_FILES):
+    """Delete all but the ``keep`` most recently used index files."""
+    try:
+        files = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".npz")]
+    except FileNotFoundError:
+        return []
+
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return files[keep:]
+
+
+def load_or_build(csr, directory=INDEX_DIR, keep=MAX_INDEX_FILES):
+    """Return the index for this combined graph, building it only once.
+
+    Returns ``(index, built)`` where ``built`` says whether it was rebuilt.
+    Loading marks the file as recently used; building evicts old files so
+    at most ``keep`` indexes stay on disk.
+    """
+    path = index_path(graph_fingerprint(csr), directory)
+    if os.path.exists(path):
+        os.utime(path)
+        return HubLabelIndex.load(path), False
+
+    index = HubLabelIndex.build(csr)
+    os.makedirs(directory, exist_ok=True)
+    index.save(path)
+    evict_old_indexes(directory, keep)
+    return index, True
@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+# -----------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------
+NO_EDGE = 9999
+CRITERIA = ("Time", "Cost", "Risk")
+EDGE_COLUMNS = ["from", "to", "time", "cost", "risk"]
+
+# Rows per chunk when streaming dense matrices / edge lists.
+# Keeps peak memory at (chunk + final array) instead of parser overhead × V².
+MATRIX_CHUNK_ROWS = 256
+EDGE_CHUNK_ROWS = 200_000
+
+
+# -----------------------------------------------------------
+# VALIDATION (shared by every input format)
+# -----------------------------------------------------------
+def validate_matrices(time_df, cost_df, risk_df):
+    """Raise ValueError if the three criterion matrices are not usable."""
+    for name, df in zip(CRITERIA, (time_df, cost_df, risk_df)):
+        if df.shape[0] != df.shape[1]:
+            raise ValueError(f"{name} matrix is not square.")
+
+    if not (list(time_df.index) == list(cost_df.index) == list(risk_df.index)):
+        raise ValueError("Sheet node labels do not match.")
+
+
+def matrices_to_graphs(time_df, cost_df, risk_df):
+    """Dense float matrices with missing lanes mapped to the 9999 sentinel."""
+    return tuple(
+        np.nan_to_num(df.to_numpy(dtype=float), nan=NO_EDGE)
+        for df in (time_df, cost_df, risk_df)
+    )
+
+
+# -----------------------------------------------------------
+# EXCEL
+# -----------------------------------------------------------
+def read_excel_matrices(file):
+    try:
+        time_df = pd.read_excel(file, sheet_name="Time", index_col=0)
+        cost_df = pd.read_excel(file, sheet_name="Cost", index_col=0)
+        risk_df = pd.read_excel(file, sheet_name="Risk", index_col=0)
+    except Exception:
+        raise ValueError("File must contain sheets: Time, Cost, Risk.")
+
+    validate_matrices(time_df, cost_df, risk_df)
+    return time_df, cost_df, risk_df
+
+
+def read_excel_spreads(file, node_labels):
+    """Optional "Time Spread" / "Cost Spread" / "Risk Spread" sheets.
+
+    Each holds the ± half-width of the matching criterion cell. Returns the
+    three arrays, or None when the workbook has no spread sheets.
+    """
+    sheets = [f"{name} Spread" for name in CRITERIA]
+    try:
+        dfs = [pd.read_excel(file, sheet_name=s, index_col=0) for s in sheets]
+    except Exception:
+        return None
+
+    for name, df in zip(sheets, dfs):
+        if df.shape != (len(node_labels), len(node_labels)):
+            raise ValueError(f"{name} matrix does not match the node count.")
+        if list(df.index) != list(node_labels):
+            raise ValueError("Sheet node labels do not match.")
+
+    return tuple(np.nan_to_num(df.to_numpy(dtype=float)) for df in dfs)
+
+
+# -----------------------------------------------------------
+# DENSE MATRIX CSV / PARQUET (one file per criterion)
+# -----------------------------------------------------------
+def _rewind(file):
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+
+def _fill_rows(out, labels, row, chunk, name):
+    n = len(chunk)
+    if row + n > out.shape[0]:
+        raise ValueError(f"{name} matrix is not square.")
+    out[row:row + n] = chunk.to_numpy(dtype=float)
+    labels.extend(str(x) for x in chunk.index)
+    return row + n
+
+
+def _finish_matrix(out, labels, columns, row, name):
+    if row != out.shape[0]:
+        raise ValueError(f"{name} matrix is not square.")
+    return pd.DataFrame(out, index=labels, columns=columns, copy=False)
+
+
+def read_matrix_csv(file, name="Matrix", chunk_rows=MATRIX_CHUNK_ROWS):
+    """Stream a square labelled matrix CSV into a preallocated float array."""
+    _rewind(file)
+    columns = [str(c) for c in pd.read_csv(file, index_col=0, nrows=0).columns]
+    _rewind(file)
+
+    out = np.empty((len(columns), len(columns)))
+    labels = []
+    row = 0
+    for chunk in pd.read_csv(file, index_col=0, chunksize=chunk_rows):
+        if chunk.shape[1] != len(columns):
+            raise ValueError(f"{name} matrix is not square.")
+        row = _fill_rows(out, labels, row, chunk, name)
+
+    return _finish_matrix(out, labels, columns, row, name)
+
+
+def _parquet_file(file):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet input requires the 'pyarrow' package.")
+    return pq.ParquetFile(file)
+
+
+def read_matrix_parquet(file, name="Matrix", chunk_rows=MATRIX_CHUNK_ROWS):
+    """Stream a square labelled matrix Parquet file in record batches.
+
+    Node labels come from the stored pandas index when present, otherwise
+    from the first column.
+    """
+    pf = _parquet_file(file)
+    names = pf.schema_arrow.names
+    index_cols = (pf.schema_arrow.pandas_metadata or {}).get("index_columns", [])
+    label_col = index_cols[0] if index_cols and isinstance(index_cols[0], str) else names[0]
+    columns = [c for c in names if c != label_col]
+
+    out = np.empty((len(columns), len(columns)))
+    labels = []
+    row = 0
+    for batch in pf.iter_batches(batch_size=chunk_rows):
+        chunk = batch.to_pandas(ignore_metadata=True).set_index(label_col)[columns]
+        row = _fill_rows(out, labels, row, chunk, name)
+
+    return _finish_matrix(out, labels, columns, row, name)
+
+
+def read_matrix_files(time_file, cost_file, risk_file, reader):
+    dfs = [reader(f, name) for f, name in zip((time_file, cost_file, risk_file), CRITERIA)]
+    validate_matrices(*dfs)
+    return tuple(dfs)
+
+
+# -----------------------------------------------------------
+# EDGE LIST (from,to,time,cost,risk) → SPARSE
+# -----------------------------------------------------------
+@dataclass
+class EdgeListGraph:
+    """Sparse multi-criteria graph: parallel arrays of (src, dst, time, cost, risk).
+
+    Missing criterion values are stored as the 9999 sentinel so the combined
+    weighting rules match the dense matrix path exactly.
+    """
+    labels: list
+    src: np.ndarray
+    dst: np.ndarray
+    time: np.ndarray
+    cost: np.ndarray
+    risk: np.ndarray
+
+    @property
+    def V(self):
+        return len(self.labels)
+
+    @classmethod
+    def from_dense(cls, labels, time_graph, cost_graph, risk_graph):
+        """Lanes of dense matrices: off-diagonal cells where any criterion is set."""
+        graphs = [np.asarray(g, dtype=float) for g in (time_graph, cost_graph, risk_graph)]
+        lanes = (graphs[0] != NO_EDGE) | (graphs[1] != NO_EDGE) | (graphs[2] != NO_EDGE)
+        np.fill_diagonal(lanes, False)
+        src, dst = np.nonzero(lanes)
+        return cls(list(labels), src.astype(np.int64), dst.astype(np.int64),
+                   *(g[src, dst] for g in graphs))
+
+    def to_dense(self):
+        """Dense (time, cost, risk) arrays, 0 on the diagonal, 9999 elsewhere."""
+        graphs = []
+        for values in (self.time, self.cost, self.risk):
+            g = np.full((self.V, self.V), float(NO_EDGE))
+            np.fill_diagonal(g, 0)
+            g[self.src, self.dst] = values
+            graphs.append(g)
+        return tuple(graphs)
+
+    def path_totals(self, path, w_time, w_cost, w_risk):
+        """compute_path_totals for a node path, read from the lane arrays."""
+        key = self.src * self.V + self.dst
+        order = np.argsort(key, kind="stable")
+        wanted = np.asarray(path[:-1], dtype=np.int64) * self.V + np.asarray(path[1:], dtype=np.int64)
+        lanes = order[np.searchsorted(key, wanted, sorter=order)]
+
+        t, c, r = (float(np.where(v[lanes] == NO_EDGE, 0, v[lanes]).sum())
+                   for v in (self.time, self.cost, self.risk))
+        return w_time * t + w_cost * c + w_risk * r, t, c, r
+
+    def combined_csr(self, w_time, w_cost, w_risk):
+        """Weighted combined graph as a CSR matrix (explicit zeros are edges)."""
+        from scipy.sparse import csr_matrix
+
+        keep = np.ones(len(self.src), dtype=bool)
+        weight = np.zeros(len(self.src))
+        for w, values in ((w_time, self.time), (w_cost, self.cost), (w_risk, self.risk)):
+            if w > 0:
+                keep &= values != NO_EDGE
+            weight += w * values
+        return csr_matrix(
+            (weight[keep], (self.src[keep], self.dst[keep])),
+            shape=(self.V, self.V)
+        )
+
+
+def _edge_chunks(file, chunk_rows):
+    _rewind(file)
+    name = getattr(file, "name", file if isinstance(file, str) else "")
+    if str(name).lower().endswith(".parquet"):
+        pf = _parquet_file(file)
+        for batch in pf.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas(ignore_metadata=True)
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_rows)
+
+
+def read_edge_list(file, chunk_rows=EDGE_CHUNK_ROWS):
+    """Read a long-form edge list (CSV or Parquet) into an EdgeListGraph.
+
+    Nodes are numbered in order of first appearance. A row whose ``from``
+    and ``to`` are equal only declares the node (useful for isolated nodes).
+    """
+    label_ids = {}
+    parts = {k: [] for k in EDGE_COLUMNS}
+
+    for chunk in _edge_chunks(file, chunk_rows):
+        chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+        missing = [c for c in EDGE_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Edge list is missing columns: {', '.join(missing)}.")
+        if chunk["from"].isna().any() or chunk["to"].isna().any():
+            raise ValueError("Edge list contains rows without a node label.")
+
+        src_labels = chunk["from"].astype(str).to_numpy()
+        dst_labels = chunk["to"].astype(str).to_numpy()
+        for label in pd.unique(np.concatenate([src_labels, dst_labels])):
+            if label not in label_ids:
+                label_ids[label] = len(label_ids)
+
+        src = pd.Series(src_labels).map(label_ids).to_numpy(dtype=np.int64)
+        dst = pd.Series(dst_labels).map(label_ids).to_numpy(dtype=np.int64)
+        lane = src != dst
+
+        parts["from"].append(src[lane])
+        parts["to"].append(dst[lane])
+        for c in ("time", "cost", "risk"):
+            values = pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float)
+            parts[c].append(np.nan_to_num(values[lane], nan=NO_EDGE))
+
+    if not label_ids:
+        raise ValueError("Edge list is empty.")
+
+    arrays = {k: np.concatenate(v) if v else np.empty(0) for k, v in parts.items()}
+    src = arrays["from"].astype(np.int64)
+    dst = arrays["to"].astype(np.int64)
+
+    V = len(label_ids)
+    if len(np.unique(src * V + dst)) != len(src):
+        raise ValueError("Edge list contains duplicate lanes.")
+
+    return EdgeListGraph(
+        labels=list(label_ids),
+        src=src,
+        dst=dst,
+        time=arrays["time"],
+        cost=arrays["cost"],
+        risk=arrays["risk"],
+    )
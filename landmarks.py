@@ -0,0 +1,142 @@
+import numpy as np
+
+from parallel import pool_map, shared
+
+# Landmarks solved per worker task
+LANDMARK_BATCH = 4
+# Exact sources solved at once when measuring the error: (chunk, V) floats
+ERROR_SOURCE_CHUNK = 16
+
+
+# -----------------------------------------------------------
+# LANDMARK SELECTION
+# -----------------------------------------------------------
+def select_landmarks(csr, n_landmarks, method="degree", seed=0):
+    """Pick landmark nodes: the busiest hubs by total degree, or at random."""
+    V = csr.shape[0]
+    n_landmarks = min(n_landmarks, V)
+    if method == "random":
+        return np.sort(np.random.default_rng(seed).choice(V, n_landmarks, replace=False))
+    if method != "degree":
+        raise ValueError(f"Unknown landmark selection '{method}'.")
+
+    degree = np.diff(csr.tocsr().indptr) + np.diff(csr.tocsc().indptr)
+    return np.sort(np.argsort(-degree, kind="stable")[:n_landmarks])
+
+
+# -----------------------------------------------------------
+# SINGLE-SOURCE SOLVES FROM / TO EACH LANDMARK
+# -----------------------------------------------------------
+def _solve_landmarks(chunk):
+    from scipy.sparse.csgraph import dijkstra
+
+    d_from = dijkstra(shared["fwd"], directed=True, indices=chunk)
+    d_to = dijkstra(shared["rev"], directed=True, indices=chunk)
+    return d_from, d_to
+
+
+class LandmarkIndex:
+    """Approximate distances from L landmarks, O(L·V) memory.
+
+    ``d_from[l, v]`` is d(landmark l → v) and ``d_to[l, v]`` is d(v → l).
+    For any pair the triangle inequality gives
+
+        upper = min_l d(s, l) + d(l, t)
+        lower = max_l max(d(l, t) - d(l, s), d(s, l) - d(t, l), 0)
+
+    and the true distance always lies in [lower, upper].
+    """
+
+    def __init__(self, landmarks, d_from, d_to):
+        self.landmarks = landmarks
+        self.d_from = d_from
+        self.d_to = d_to
+
+    @classmethod
+    def build(cls, csr, n_landmarks=16, method="degree", max_workers=None,
+              batch=LANDMARK_BATCH, seed=0):
+        landmarks = select_landmarks(csr, n_landmarks, method, seed)
+        chunks = [landmarks[k:k + batch] for k in range(0, len(landmarks), batch)]
+
+        parts = pool_map(_solve_landmarks, chunks, max_workers=max_workers,
+                         shared_data={"fwd": csr.tocsr(), "rev": csr.T.tocsr()})
+
+        d_from = np.vstack([p[0] for p in parts])
+        d_to = np.vstack([p[1] for p in parts])
+        return cls(landmarks, d_from, d_to)
+
+    def bounds(self, s, t):
+        """Vectorized (lower, upper) bounds for arrays of sources and targets."""
+        s = np.asarray(s)
+        t = np.asarray(t)
+        from_s, from_t = self.d_from[:, s], self.d_from[:, t]
+        to_s, to_t = self.d_to[:, s], self.d_to[:, t]
+
+        upper = np.min(to_s + from_t, axis=0)
+
+        with np.errstate(invalid="ignore"):
+            forward = from_t - from_s
+            backward = to_s - to_t
+        # l reaches s but not t, or t reaches l but s does not: s cannot reach t
+        forward = np.where(np.isfinite(from_s) & ~np.isfinite(from_t), np.inf,
+                           np.where(np.isfinite(forward), forward, 0))
+        backward = np.where(~np.isfinite(to_s) & np.isfinite(to_t), np.inf,
+                            np.where(np.isfinite(backward), backward, 0))
+        lower = np.maximum(np.max(np.maximum(forward, backward), axis=0), 0)
+
+        same = s == t
+        upper = np.where(same, 0, upper)
+        lower = np.where(same, 0, np.minimum(lower, upper))
+        return lower, upper
+
+    @property
+    def nbytes(self):
+        return self.d_from.nbytes + self.d_to.nbytes
+
+
+# -----------------------------------------------------------
+# ACCURACY ON SAMPLED PAIRS
+# -----------------------------------------------------------
+def approximation_error(index, csr, n_pairs=200, seed=0, chunk=ERROR_SOURCE_CHUNK):
+    """Compare the bounds with exact Dijkstra distances on random pairs.
+
+    Each distinct source gets one Dijkstra, so the check costs at most
+    ``n_pairs`` single-source solves. Sources are solved in chunks of
+    ``chunk`` and only the sampled targets are kept, so memory stays
+    O(chunk · V) however many pairs are sampled.
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    V = csr.shape[0]
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(V, size=n_pairs)
+    targets = rng.integers(V, size=n_pairs)
+
+    exact = np.empty(n_pairs)
+    unique, inverse = np.unique(sources, return_inverse=True)
+    for start in range(0, len(unique), chunk):
+        block = np.flatnonzero((inverse >= start) & (inverse < start + chunk))
+        dist = dijkstra(csr, directed=True, indices=unique[start:start + chunk])
+        exact[block] = dist[inverse[block] - start, targets[block]]
+    lower, upper = index.bounds(sources, targets)
+
+    reachable = np.isfinite(exact) & (exact > 0)
+    # Pairs no landmark route connects keep an infinite upper bound
+    bounded = reachable & np.isfinite(upper)
+    rel_upper = (upper[bounded] - exact[bounded]) / exact[bounded]
+    rel_lower = (exact[reachable] - lower[reachable]) / exact[reachable]
+    unreachable = ~np.isfinite(exact)
+
+    def stat(f, x):
+        return float(f(x)) if len(x) else float("nan")
+
+    return {
+        "Pairs": int(n_pairs),
+        "Reachable": int(reachable.sum()),
+        "Upper Bound Found": stat(np.mean, bounded[reachable]),
+        "Upper Bound Exact": stat(np.mean, rel_upper <= 1e-9),
+        "Mean Upper Error": stat(np.mean, rel_upper),
+        "Max Upper Error": stat(np.max, rel_upper),
+        "Mean Lower Error": stat(np.mean, rel_lower),
+        "Unreachable Detected": stat(np.mean, ~np.isfinite(lower[unreachable])),
+    }
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from pathfinding import NO_SUCCESSOR, compute_path_totals
+
+TARGET_SHEET = "Targets"
+
+
+# -----------------------------------------------------------
+# TARGET TAGS
+# -----------------------------------------------------------
+def read_targets(file, node_labels):
+    """Optional "Targets" sheet: one row per tagged node, columns Node and Type.
+
+    Returns {type: [node index, ...]}; empty when the sheet is absent.
+    A missing Type column tags every listed node as "Target".
+    """
+    try:
+        df = pd.read_excel(file, sheet_name=TARGET_SHEET)
+    except Exception:
+        return {}
+
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "node" not in df.columns:
+        raise ValueError(f"'{TARGET_SHEET}' sheet must have a 'Node' column.")
+    types = df["type"].astype(str) if "type" in df.columns else pd.Series("Target", index=df.index)
+
+    index = {str(label): i for i, label in enumerate(node_labels)}
+    groups = {}
+    for node, kind in zip(df["node"].astype(str), types):
+        if node not in index:
+            raise ValueError(f"'{TARGET_SHEET}' sheet lists unknown node '{node}'.")
+        groups.setdefault(kind.strip(), []).append(index[node])
+    return groups
+
+
+# -----------------------------------------------------------
+# MULTI-SOURCE SHORTEST PATH TO THE NEAREST TARGET
+# -----------------------------------------------------------
+def nearest_targets(csr, targets):
+    """One multi-source Dijkstra from all targets on the reversed graph.
+
+    Returns per-node arrays ``(dist, next_hop, target)``: the combined
+    distance to the closest target, the first hop towards it and which
+    target it is (inf / -1 / -1 when no target is reachable).
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    targets = np.unique(np.asarray(targets, dtype=np.int64))
+    dist, pred, source = dijkstra(
+        csr.T.tocsr(), directed=True, indices=targets, min_only=True,
+        return_predecessors=True
+    )
+    next_hop = np.where(pred < 0, NO_SUCCESSOR, pred).astype(np.int64)
+    source = np.where(source < 0, NO_SUCCESSOR, source).astype(np.int64)
+    return dist, next_hop, source
+
+
+def nearest_table(csr, targets, node_labels, orig_time, orig_cost, orig_risk,
+                  w_time, w_cost, w_risk):
+    dist, next_hop, source = nearest_targets(csr, targets)
+
+    rows = []
+    for v in range(len(node_labels)):
+        if source[v] < 0:
+            rows.append({"Node": node_labels[v], "Nearest": None, "Path": "NO PATH",
+                         "Total Score": None, "Total Time": None,
+                         "Total Cost": None, "Total Risk": None})
+            continue
+
+        path = [v]
+        while path[-1] != source[v]:
+            path.append(int(next_hop[path[-1]]))
+        total_w, total_t, total_c, total_r = compute_path_totals(
+            path, orig_time, orig_cost, orig_risk, w_time, w_cost, w_risk
+        )
+        rows.append({
+            "Node": node_labels[v],
+            "Nearest": node_labels[source[v]],
+            "Path": " → ".join(node_labels[p] for p in path),
+            "Total Score": round(total_w, 2),
+            "Total Time": round(total_t, 2),
+            "Total Cost": round(total_c, 2),
+            "Total Risk": round(total_r, 2),
+        })
+    return pd.DataFrame(rows)
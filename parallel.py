@@ -0,0 +1,37 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Read-only data sent to each worker process once, at pool start-up
+shared = {}
+
+
+def _share(data):
+    shared.clear()
+    shared.update(data)
+
+
+# -----------------------------------------------------------
+# PROCESS POOL MAP
+# -----------------------------------------------------------
+def pool_map(fn, jobs, shared_data=None, max_workers=None):
+    """``[fn(job) for job in jobs]`` spread over a process pool.
+
+    ``shared_data`` (a dict) is handed to every worker once and read there
+    through ``shared``, so large arrays are not pickled with each job.
+    With one worker, or a single job, everything runs inline.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1:
+        _share(shared_data or {})
+        try:
+            return [fn(job) for job in jobs]
+        finally:
+            shared.clear()
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_share,
+                             initargs=(shared_data or {},)) as pool:
+        return list(pool.map(fn, jobs))
@@ -0,0 +1,88 @@
+import numpy as np
+
+NO_EDGE = 9999
+NO_SUCCESSOR = -1
+
+
+# -----------------------------------------------------------
+# WEIGHTED COMBINED GRAPH
+# -----------------------------------------------------------
+def combine_weights(time_graph, cost_graph, risk_graph, w_time, w_cost, w_risk):
+    """w·(time, cost, risk) per lane; 9999 wherever a weighted criterion is missing."""
+    final_graph = np.zeros(np.shape(time_graph))
+    blocked = np.zeros(np.shape(time_graph), dtype=bool)
+
+    for g, w in ((time_graph, w_time), (cost_graph, w_cost), (risk_graph, w_risk)):
+        g = np.asarray(g, dtype=float)
+        if w > 0:
+            blocked |= g == 9999
+        final_graph += w * g
+
+    final_graph[blocked] = 9999
+    return final_graph
+
+
+# -----------------------------------------------------------
+# FLOYD–WARSHALL WITH PATH RECONSTRUCTION
+# -----------------------------------------------------------
+def floydWarshall_with_path(graph):
+    V = len(graph)
+    next_node = [[None] * V for _ in range(V)]
+
+    for i in range(V):
+        for j in range(V):
+            if graph[i][j] != 9999 and i != j:
+                next_node[i][j] = j
+
+    for k in range(V):
+        for i in range(V):
+            for j in range(V):
+                if graph[i][k] + graph[k][j] < graph[i][j]:
+                    graph[i][j] = graph[i][k] + graph[k][j]
+                    next_node[i][j] = next_node[i][k]
+
+    return graph, next_node
+
+
+def reconstruct_path(i, j, next_node):
+    # Successors are either nested lists (None = no path) or int arrays (-1)
+    if next_node[i][j] is None or next_node[i][j] < 0:
+        return None
+    path = [i]
+    while i != j:
+        i = next_node[i][j]
+        path.append(i)
+    return path
+
+
+def as_successor_array(next_node):
+    """Successor matrix as an int array, NO_SUCCESSOR where there is no path."""
+    if isinstance(next_node, np.ndarray):
+        return next_node.astype(np.int64, copy=False)
+    return np.array(
+        [[NO_SUCCESSOR if n is None else n for n in row] for row in next_node],
+        dtype=np.int64
+    ).reshape(len(next_node), len(next_node))
+
+
+# -----------------------------------------------------------
+# PATH TOTALS (Weighted + Time + Cost + Risk)
+# -----------------------------------------------------------
+def compute_path_totals(path, orig_time, orig_cost, orig_risk,
+                        w_time, w_cost, w_risk):
+    total_time = total_cost = total_risk = total_weighted = 0
+
+    for k in range(len(path) - 1):
+        i = path[k]
+        j = path[k + 1]
+
+        t = orig_time[i][j] if orig_time[i][j] != 9999 else 0
+        c = orig_cost[i][j] if orig_cost[i][j] != 9999 else 0
+        r = orig_risk[i][j] if orig_risk[i][j] != 9999 else 0
+
+        total_time += t
+        total_cost += c
+        total_risk += r
+        total_weighted += w_time * t + w_cost * c + w_risk * r
+
+    return total_weighted, total_time, total_cost, total_risk
@@ -0,0 +1,70 @@
+import numpy as np
+
+from pathfinding import NO_EDGE
+
+
+# -----------------------------------------------------------
+# PARETO-DOMINATED LANE PRUNING
+# -----------------------------------------------------------
+def dominated_edges(time_graph, cost_graph, risk_graph):
+    """Boolean mask of lanes beaten by a two-hop alternative on every criterion.
+
+    Lane i→j is dominated when some i→k→j is no worse in time, cost and risk
+    and strictly better in at least one criterion the lane actually has.
+    A missing value (9999) counts as +inf, matching the combination rule
+    where a missing criterion disables the lane whenever its weight is > 0.
+
+    For any non-negative weights the alternative is then at most as long as
+    the lane, and every lane it uses is itself strictly "smaller" (fewer
+    missing criteria, or a smaller total over the lane's criteria), so
+    removing all dominated lanes at once leaves every shortest distance
+    unchanged. With negative values the guarantee fails and nothing is pruned.
+    """
+    crits = [np.where(np.asarray(g) == NO_EDGE, np.inf, np.asarray(g, dtype=float))
+             for g in (time_graph, cost_graph, risk_graph)]
+    V = len(crits[0])
+    if any((g < 0).any() for g in crits):
+        return np.zeros((V, V), dtype=bool)
+
+    for g in crits:
+        np.fill_diagonal(g, np.inf)
+
+    lane = np.zeros((V, V), dtype=bool)
+    for g in crits:
+        lane |= np.isfinite(g)
+
+    dominated = np.zeros((V, V), dtype=bool)
+
+    # Only (i, k, j) with lanes i→k and k→j can dominate, so the work is
+    # sum_k indeg(k)·outdeg(k) rather than V³.
+    for k in range(V):
+        rows = np.flatnonzero(lane[:, k])
+        cols = np.flatnonzero(lane[k, :])
+        if not len(rows) or not len(cols):
+            continue
+
+        no_worse = np.ones((len(rows), len(cols)), dtype=bool)
+        strictly = np.zeros((len(rows), len(cols)), dtype=bool)
+        for g in crits:
+            direct = g[np.ix_(rows, cols)]
+            two_hop = g[rows, k][:, None] + g[k, cols][None, :]
+            no_worse &= two_hop <= direct
+            strictly |= (two_hop < direct) & np.isfinite(direct)
+
+        dominated[np.ix_(rows, cols)] |= no_worse & strictly
+
+    return dominated & lane
+
+
+def prune_dominated(time_graph, cost_graph, risk_graph):
+    """Copies of the three matrices with dominated lanes set to 9999.
+
+    Returns ``(time_graph, cost_graph, risk_graph, removed)``.
+    """
+    mask = dominated_edges(time_graph, cost_graph, risk_graph)
+    pruned = []
+    for g in (time_graph, cost_graph, risk_graph):
+        g = np.array(g, dtype=float)
+        g[mask] = NO_EDGE
+        pruned.append(g)
+    return (*pruned, int(mask.sum()))
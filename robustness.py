@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+from pathfinding import NO_EDGE, as_successor_array, reconstruct_path
+
+# Samples solved together along the leading axis (at most; see sample_chunk)
+SAMPLE_CHUNK = 64
+# Bytes the sample stacks of one chunk may use
+MEMORY_BUDGET = 256 * 2 ** 20
+# Histogram bins per routed pair and total, used for streaming percentiles
+PERCENTILE_BINS = 64
+# Batched solves cost S·V³; above this the mode is too slow to be interactive
+ROBUSTNESS_MAX_NODES = 300
+# Totals reported for the nominal route: weighted score, then each criterion
+TOTALS = ("Score", "Time", "Cost", "Risk")
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def sample_chunk(V, budget=MEMORY_BUDGET):
+    """Samples per chunk so that ~9 V² floats per sample fit in ``budget``
+    (three criterion stacks, the combined stack and the solver temporaries)."""
+    return int(max(1, min(SAMPLE_CHUNK, budget // (9 * 8 * V * V))))
+
+
+# -----------------------------------------------------------
+# BATCHED FLOYD–WARSHALL (distances only, sample axis first)
+# -----------------------------------------------------------
+def batched_floyd_warshall(dist):
+    """In-place min-plus closure of a (S, V, V) stack; inf marks no lane."""
+    V = dist.shape[-1]
+    for k in range(V):
+        np.minimum(dist, dist[:, :, k, None] + dist[:, None, k, :], out=dist)
+    return dist
+
+
+# -----------------------------------------------------------
+# SAMPLING
+# -----------------------------------------------------------
+def weight_bounds(graphs, spreads=None, pct=0.1):
+    """Per-criterion (low, high) bounds of each cell's uniform distribution.
+
+    ``spreads`` are absolute half-widths (e.g. from "Time Spread" sheets);
+    without them every cell varies by ±``pct`` of its value. Values never
+    go below zero.
+    """
+    bounds = []
+    for idx, g in enumerate(graphs):
+        g = np.asarray(g, dtype=float)
+        missing = g == NO_EDGE
+        s = np.abs(g) * pct if spreads is None else np.nan_to_num(np.asarray(spreads[idx], dtype=float))
+        base = np.where(missing, 0, g)
+        s = np.where(missing, 0, s)
+        bounds.append((np.maximum(base - s, 0), np.maximum(base + s, 0)))
+    return bounds
+
+
+def blocked_lanes(graphs, weights):
+    """Lanes missing a criterion whose weight is > 0 (same rule as the app)."""
+    blocked = np.zeros(np.shape(graphs[0]), dtype=bool)
+    for g, w in zip(graphs, weights):
+        if w > 0:
+            blocked |= np.asarray(g) == NO_EDGE
+    return blocked
+
+
+def _combine(samples, weights, blocked):
+    """Weighted combined stack with inf for lanes the nominal graph lacks."""
+    combined = sum(w * s for w, s in zip(weights, samples))
+    combined[:, blocked] = np.inf
+    idx = np.arange(combined.shape[-1])
+    combined[:, idx, idx] = 0
+    return combined
+
+
+# -----------------------------------------------------------
+# NOMINAL ROUTE TOTALS UNDER SAMPLED WEIGHTS
+# -----------------------------------------------------------
+def route_totals(stacks, next_node, rows, cols):
+    """Totals of the nominal routes rows[p] → cols[p] in each (S, V, V) stack.
+
+    Returns one (S, P) array per stack. All routes are walked one hop at a
+    time in lockstep (iterations = longest hop count).
+    """
+    cur = np.array(rows)
+    totals = [np.zeros((stack.shape[0], len(rows))) for stack in stacks]
+    active = np.flatnonzero(cur != cols)
+    while len(active):
+        hop = next_node[cur[active], cols[active]]
+        for total, stack in zip(totals, stacks):
+            total[:, active] += stack[:, cur[active], hop]
+        cur[active] = hop
+        active = active[hop != cols[active]]
+    return totals
+
+
+def _percentiles(hist, lo, hi, qs):
+    """Linear-interpolated percentiles from per-pair histograms."""
+    bins = hist.shape[0]
+    cum = np.cumsum(hist, axis=0)
+    total = cum[-1]
+    width = (hi - lo) / bins
+    out = []
+    for q in qs:
+        target = q * total
+        b = np.minimum((cum < target[None]).sum(axis=0), bins - 1)
+        before = np.where(b > 0, np.take_along_axis(cum, np.maximum(b - 1, 0)[None], 0)[0], 0)
+        inside = np.take_along_axis(hist, b[None], 0)[0]
+        frac = np.divide(target - before, inside, out=np.zeros_like(lo), where=inside > 0)
+        out.append(lo + (b + frac) * width)
+    return out
+
+
+# -----------------------------------------------------------
+# MONTE-CARLO ROBUSTNESS
+# -----------------------------------------------------------
+def monte_carlo_robustness(graphs, weights, next_node,
+                           n_samples=1000, spreads=None, pct=0.1,
+                           chunk=None, seed=0, qs=QUANTILES):
+    """Sample criterion weights and solve the samples in batches.
+
+    ``graphs`` are the unpruned (time, cost, risk) matrices and ``next_node``
+    the successors of the nominal solve. Returns ``(win_rate, percentiles)``
+    where ``win_rate[i, j]`` is the share of samples in which the nominal
+    route is still a shortest route and ``percentiles[total]`` holds one
+    (V, V) array per quantile of the nominal route's sampled total, for each
+    of TOTALS. Pairs without a route are NaN.
+
+    Histograms are kept for routed pairs only, and ``chunk`` defaults to
+    what fits in MEMORY_BUDGET, so memory stays bounded for any sample count.
+    """
+    next_node = as_successor_array(next_node)
+    blocked = blocked_lanes(graphs, weights)
+    bounds = weight_bounds(graphs, spreads, pct)
+    V = len(blocked)
+    chunk = chunk or sample_chunk(V)
+
+    rows, cols = np.nonzero(next_node >= 0)
+    routed = rows != cols
+    rows, cols = rows[routed], cols[routed]
+    pairs = np.arange(len(rows))
+
+    # Every sampled total lies between the route's all-low and all-high
+    # totals, so fixed histogram bins per pair give bounded-memory percentiles.
+    extremes = [np.stack([b[0], b[1]]) for b in bounds]
+    extremes = np.stack(route_totals([_combine(extremes, weights, blocked)] + extremes,
+                                     next_node, rows, cols))
+    lo, hi = extremes[:, 0], extremes[:, 1]
+    hi = np.maximum(hi, lo + 1e-12)
+
+    rng = np.random.default_rng(seed)
+    wins = np.zeros(len(rows), dtype=np.int64)
+    count = np.uint16 if n_samples < 2 ** 16 else np.int32
+    hist = np.zeros((len(TOTALS), PERCENTILE_BINS, len(rows)), dtype=count)
+
+    for start in range(0, n_samples, chunk):
+        size = min(chunk, n_samples - start)
+        samples = [rng.uniform(b[0], b[1], size=(size, V, V)) for b in bounds]
+        combined = _combine(samples, weights, blocked)
+        totals = np.stack(route_totals([combined] + samples, next_node, rows, cols))
+        del samples
+
+        best = batched_floyd_warshall(combined)[:, rows, cols]
+        wins += (totals[0] <= best + 1e-9 * (1 + np.abs(best))).sum(axis=0)
+
+        b = ((totals - lo[:, None]) / (hi - lo)[:, None] * PERCENTILE_BINS).astype(np.int64)
+        b = np.clip(b, 0, PERCENTILE_BINS - 1)
+        for k in range(len(TOTALS)):
+            for s in range(size):
+                hist[k, b[k, s], pairs] += 1
+
+    def to_matrix(values):
+        out = np.full((V, V), np.nan)
+        out[rows, cols] = values
+        return out
+
+    win_rate = to_matrix(wins / n_samples)
+    percentiles = {
+        name: [to_matrix(p) for p in _percentiles(hist[k], lo[k], hi[k], qs)]
+        for k, name in enumerate(TOTALS)
+    }
+    return win_rate, percentiles
+
+
+def robustness_table(win_rate, percentiles, next_node, node_labels, qs=QUANTILES):
+    next_node = as_successor_array(next_node)
+    rows = []
+    V = len(node_labels)
+    for i in range(V):
+        for j in range(V):
+            if i == j or next_node[i, j] < 0:
+                continue
+            path = reconstruct_path(i, j, next_node)
+            row = {
+                "From": node_labels[i],
+                "To": node_labels[j],
+                "Path": " → ".join(node_labels[p] for p in path),
+                "Win Rate": round(float(win_rate[i, j]), 3),
+            }
+            for name in TOTALS:
+                for q, p in zip(qs, percentiles[name]):
+                    row[f"{name} P{int(round(q * 100))}"] = round(float(p[i, j]), 2)
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,160 @@
+import numpy as np
+from dataclasses import dataclass
+
+from pathfinding import NO_EDGE, NO_SUCCESSOR, as_successor_array, floydWarshall_with_path
+
+
+# -----------------------------------------------------------
+# STRONGLY CONNECTED COMPONENTS + CONDENSATION DAG
+# -----------------------------------------------------------
+@dataclass
+class Condensation:
+    """SCC decomposition of a weighted graph.
+
+    ``labels[v]`` is the component of node ``v``; ``dag[a, b]`` is True when
+    some lane leads from component ``a`` to component ``b``; ``order`` lists
+    the components in topological order of the DAG.
+    """
+    labels: np.ndarray
+    dag: np.ndarray
+    order: list
+
+    @property
+    def n_components(self):
+        return len(self.order)
+
+    def members(self, c):
+        return np.flatnonzero(self.labels == c)
+
+    def reachable(self):
+        """Component reachability (excluding a component reaching itself)."""
+        reach = np.zeros_like(self.dag)
+        for c in reversed(self.order):
+            succ = np.flatnonzero(self.dag[c])
+            if len(succ):
+                reach[c] = self.dag[c] | reach[succ].any(axis=0)
+        return reach
+
+    def unreachable_pairs(self):
+        """Number of ordered node pairs (i != j) with no route at all."""
+        reach = self.reachable()
+        np.fill_diagonal(reach, True)
+        sizes = np.bincount(self.labels, minlength=self.n_components)
+        reachable_pairs = sizes @ reach @ sizes - len(self.labels)
+        return len(self.labels) * (len(self.labels) - 1) - int(reachable_pairs)
+
+
+def condense(graph):
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    adj = np.asarray(graph) != NO_EDGE
+    np.fill_diagonal(adj, False)
+
+    n_comp, labels = connected_components(
+        csr_matrix(adj), directed=True, connection="strong"
+    )
+
+    src, dst = np.nonzero(adj)
+    cross = labels[src] != labels[dst]
+    dag = np.zeros((n_comp, n_comp), dtype=bool)
+    dag[labels[src[cross]], labels[dst[cross]]] = True
+
+    # Kahn's algorithm
+    indegree = dag.sum(axis=0)
+    ready = list(np.flatnonzero(indegree == 0))
+    order = []
+    while ready:
+        c = ready.pop()
+        order.append(c)
+        for d in np.flatnonzero(dag[c]):
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                ready.append(d)
+
+    return Condensation(labels=labels, dag=dag, order=order)
+
+
+# -----------------------------------------------------------
+# ALL-PAIRS SOLVE, ONE COMPONENT AT A TIME
+# -----------------------------------------------------------
+def solve_by_components(graph, solver=floydWarshall_with_path, condensation=None, select=None):
+    """All-pairs shortest paths via the SCC condensation.
+
+    Each component is solved on its own with ``solver``, or with
+    ``select(submatrix)`` when given, so a backend can be chosen for each
+    component's own size and density. Routes leaving a
+    component are then built in reverse topological order: the best way out
+    of component A to any downstream node is the best (intra-A distance +
+    exit lane + already-solved downstream distance). Pairs with no route in
+    the condensation DAG are never relaxed.
+
+    Returns ``(dist, next_node)`` with 9999 / -1 marking unreachable pairs.
+    """
+    graph = np.asarray(graph, dtype=float)
+    V = len(graph)
+    if condensation is None:
+        condensation = condense(graph)
+
+    labels, dag = condensation.labels, condensation.dag
+    dist = np.full((V, V), np.inf)
+    next_node = np.full((V, V), NO_SUCCESSOR, dtype=np.int64)
+    reach = np.zeros_like(dag)
+
+    for c in reversed(condensation.order):
+        a = condensation.members(c)
+        k = len(a)
+
+        # A single node needs no solve: distance 0 to itself, no successor
+        sub = graph[np.ix_(a, a)]
+        if k == 1:
+            sub_dist, sub_next = np.zeros((1, 1)), np.full((1, 1), NO_SUCCESSOR, dtype=np.int64)
+        else:
+            sub_dist, sub_next = (select(sub) if select is not None else solver)(sub)
+        sub_dist = np.asarray(sub_dist, dtype=float)
+        sub_next = as_successor_array(sub_next)
+        np.fill_diagonal(sub_dist, 0)
+
+        dist[np.ix_(a, a)] = sub_dist
+        next_node[np.ix_(a, a)] = np.where(sub_next >= 0, a[np.maximum(sub_next, 0)], NO_SUCCESSOR)
+
+        succ = np.flatnonzero(dag[c])
+        if not len(succ):
+            continue
+        reach[c] = dag[c] | reach[succ].any(axis=0)
+
+        # Best way from each i in A to each exit head x: min_u d(i, u) + w(u, x)
+        exits = np.flatnonzero(dag[c][labels])
+        lanes = graph[np.ix_(a, exits)]
+        lanes = np.where(lanes == NO_EDGE, np.inf, lanes)
+
+        exit_cost = np.full((k, len(exits)), np.inf)
+        exit_tail = np.zeros((k, len(exits)), dtype=np.int64)
+        for u in range(k):
+            cand = sub_dist[:, u, None] + lanes[u][None, :]
+            better = cand < exit_cost
+            exit_cost[better] = cand[better]
+            exit_tail[better] = a[u]
+
+        # Extend to every downstream node j: min_x exit_cost(i, x) + d(x, j)
+        targets = np.flatnonzero(reach[c][labels])
+        best = np.full((k, len(targets)), np.inf)
+        best_exit = np.zeros((k, len(targets)), dtype=np.int64)
+        for t, x in enumerate(exits):
+            onward = dist[x, targets]
+            cand = exit_cost[:, t, None] + onward[None, :]
+            better = cand < best
+            best[better] = cand[better]
+            best_exit[better] = t
+
+        found = np.isfinite(best)
+        heads = exits[best_exit]
+        tails = np.take_along_axis(exit_tail, best_exit, axis=1)
+        rows = np.broadcast_to(a[:, None], tails.shape)
+        hop = np.where(tails == rows, heads, next_node[rows, tails])
+
+        dist[np.ix_(a, targets)] = best
+        next_node[np.ix_(a, targets)] = np.where(found, hop, NO_SUCCESSOR)
+
+    dist[~np.isfinite(dist)] = NO_EDGE
+    return dist, next_node
@@ -0,0 +1,265 @@
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ingest import matrices_to_graphs, read_excel_matrices, validate_matrices
+from parallel import pool_map
+from pathfinding import NO_EDGE, NO_SUCCESSOR, as_successor_array, combine_weights, reconstruct_path
+from solvers import get_solver, pick_solver
+
+# "Time 2024-03-01", "Cost_week12", "risk-2024W10", ...
+SNAPSHOT_SHEET = re.compile(r"^(time|cost|risk)[\s_-]+(.+)$", re.IGNORECASE)
+
+# Above this share of changed lanes a warm start is slower than a full solve
+WARM_START_MAX_CHANGED = 0.05
+
+
+# -----------------------------------------------------------
+# READING SNAPSHOTS
+# -----------------------------------------------------------
+@dataclass
+class Snapshot:
+    label: str
+    node_labels: list
+    time: np.ndarray
+    cost: np.ndarray
+    risk: np.ndarray
+
+    @property
+    def graphs(self):
+        return self.time, self.cost, self.risk
+
+
+def _natural_key(label):
+    # Digit runs compare as numbers: "week9" < "week10", "2" < "10"
+    parts = re.split(r"(\d+)", label)
+    return [int(part) if k % 2 else part.lower() for k, part in enumerate(parts)]
+
+
+def _sort_key(label):
+    """Dated labels in time order, then the rest in natural order."""
+    try:
+        return (0, pd.Timestamp(label), _natural_key(label))
+    except (ValueError, TypeError):
+        return (1, pd.Timestamp.min, _natural_key(label))
+
+
+def _check_nodes(snapshots):
+    if not snapshots:
+        raise ValueError("No snapshots found.")
+    for snap in snapshots[1:]:
+        if snap.node_labels != snapshots[0].node_labels:
+            raise ValueError(f"Snapshot '{snap.label}' node labels do not match '{snapshots[0].label}'.")
+    return snapshots
+
+
+def read_snapshot_workbook(file):
+    """Dated sheet triples ("Time <date>", "Cost <date>", "Risk <date>") in one workbook."""
+    sheets = pd.ExcelFile(file).sheet_names
+    triples = {}
+    for name in sheets:
+        m = SNAPSHOT_SHEET.match(name.strip())
+        if m:
+            triples.setdefault(m.group(2).strip(), {})[m.group(1).capitalize()] = name
+
+    snapshots = []
+    for label in sorted(triples, key=_sort_key):
+        names = triples[label]
+        if set(names) != {"Time", "Cost", "Risk"}:
+            raise ValueError(f"Snapshot '{label}' needs Time, Cost and Risk sheets.")
+        dfs = [pd.read_excel(file, sheet_name=names[c], index_col=0) for c in ("Time", "Cost", "Risk")]
+        validate_matrices(*dfs)
+        snapshots.append(Snapshot(label, list(dfs[0].index), *matrices_to_graphs(*dfs)))
+    return _check_nodes(snapshots)
+
+
+def read_snapshot_files(files):
+    """One Time/Cost/Risk workbook per snapshot, ordered by file name."""
+    snapshots = []
+    for f in sorted(files, key=lambda f: _sort_key(os.path.splitext(os.path.basename(getattr(f, "name", str(f))))[0])):
+        label = os.path.splitext(os.path.basename(getattr(f, "name", str(f))))[0]
+        try:
+            dfs = read_excel_matrices(f)
+        except ValueError as e:
+            raise ValueError(f"{label}: {e}")
+        snapshots.append(Snapshot(label, list(dfs[0].index), *matrices_to_graphs(*dfs)))
+    return _check_nodes(snapshots)
+
+
+# -----------------------------------------------------------
+# COLD SOLVES (one process per snapshot)
+# -----------------------------------------------------------
+def _solve_snapshot(args):
+    graphs, weights, solver_name = args
+    final_graph = combine_weights(*graphs, *weights)
+    name = pick_solver(final_graph) if solver_name == "Auto" else solver_name
+    dist, next_node = get_solver(name)(final_graph)
+    return final_graph, np.asarray(dist, dtype=float), as_successor_array(next_node)
+
+
+def solve_parallel(snapshots, weights, solver_name="Auto", max_workers=None):
+    """Solve every snapshot independently across a process pool."""
+    jobs = [(snap.graphs, weights, solver_name) for snap in snapshots]
+    results = pool_map(_solve_snapshot, jobs, max_workers=max_workers)
+    return results, ["full"] * len(results)
+
+
+# -----------------------------------------------------------
+# WARM STARTS (edge diff against the previous snapshot)
+# -----------------------------------------------------------
+def warm_update(prev_graph, prev_dist, prev_next, graph):
+    """Update a solved snapshot to a new combined graph via its lane diff.
+
+    Raised or removed lanes only invalidate the destination columns whose
+    routing tree uses them; those columns are re-solved with one Dijkstra
+    per destination on the reversed graph. Lowered or new lanes are then
+    applied one at a time with the O(V²) single-lane relaxation
+    ``d(i, j) = min(d(i, j), d(i, u) + w + d(v, j))``.
+
+    Returns ``(dist, next_node, how)`` or None when a full solve is cheaper.
+    """
+    prev_graph = np.asarray(prev_graph, dtype=float)
+    graph = np.asarray(graph, dtype=float)
+    V = len(graph)
+    off_diag = ~np.eye(V, dtype=bool)
+
+    old = np.where(prev_graph == NO_EDGE, np.inf, prev_graph)
+    new = np.where(graph == NO_EDGE, np.inf, graph)
+    changed = (old != new) & off_diag
+    n_changed = int(changed.sum())
+    if n_changed == 0:
+        return prev_dist.copy(), prev_next.copy(), "reused"
+
+    lanes = max(int((np.isfinite(new) & off_diag).sum()), 1)
+    if n_changed > WARM_START_MAX_CHANGED * lanes or (new[off_diag] < 0).any():
+        return None
+
+    dist = np.where(prev_dist == NO_EDGE, np.inf, prev_dist)
+    next_node = prev_next.copy()
+
+    # 1. Raised / removed lanes: re-solve only the destinations that route over them
+    up_u, up_v = np.nonzero(changed & (new > old))
+    if len(up_u):
+        stale = (next_node[up_u, :] == up_v[:, None]).any(axis=0)
+        dests = np.flatnonzero(stale)
+        if len(dests):
+            from scipy.sparse import csr_matrix
+            from scipy.sparse.csgraph import dijkstra
+
+            # Lowered lanes keep their old weight until step 2
+            g1 = np.where(changed & (new < old), old, new)
+            src, dst = np.nonzero(np.isfinite(g1) & off_diag)
+            reverse = csr_matrix((g1[src, dst], (dst, src)), shape=(V, V))
+            dist_t, pred_t = dijkstra(reverse, directed=True, indices=dests,
+                                      return_predecessors=True)
+            dist[:, dests] = dist_t.T
+            next_node[:, dests] = np.where(pred_t.T < 0, NO_SUCCESSOR, pred_t.T)
+
+    # 2. Lowered / new lanes: exact single-lane relaxations
+    down_u, down_v = np.nonzero(changed & (new < old))
+    for u, v in zip(down_u, down_v):
+        cand = dist[:, u, None] + new[u, v] + dist[None, v, :]
+        better = cand < dist
+        if not better.any():
+            continue
+        dist[better] = cand[better]
+        hop = np.where(np.arange(V) == u, v, next_node[:, u])
+        next_node[better] = np.broadcast_to(hop[:, None], (V, V))[better]
+
+    np.fill_diagonal(next_node, NO_SUCCESSOR)
+    dist[~np.isfinite(dist)] = NO_EDGE
+    return dist, next_node, f"warm ({n_changed} lanes changed)"
+
+
+def solve_warm(snapshots, weights, solver_name="Auto"):
+    """Solve the first snapshot cold and each later one from its predecessor."""
+    results, how = [], []
+    for snap in snapshots:
+        final_graph = combine_weights(*snap.graphs, *weights)
+        update = None
+        if results:
+            prev_graph, prev_dist, prev_next = results[-1]
+            update = warm_update(prev_graph, prev_dist, prev_next, final_graph)
+
+        if update is None:
+            results.append(_solve_snapshot((snap.graphs, weights, solver_name)))
+            how.append("full")
+        else:
+            dist, next_node, note = update
+            results.append((final_graph, dist, next_node))
+            how.append(note)
+    return results, how
+
+
+# -----------------------------------------------------------
+# PER-PAIR HISTORY
+# -----------------------------------------------------------
+def route_changed(prev_next, next_node):
+    """Pairs whose route differs: some node on the old route has a new successor.
+
+    All old routes are walked in lockstep, so no path is expanded.
+    """
+    V = len(next_node)
+    rows, dest = np.indices((V, V))
+    changed = (prev_next >= 0) != (next_node >= 0)
+    cur = rows.copy()
+    active = (prev_next >= 0) & (next_node >= 0) & (rows != dest)
+    while active.any():
+        changed[active] |= next_node[cur[active], dest[active]] != prev_next[cur[active], dest[active]]
+        cur[active] = prev_next[cur[active], dest[active]]
+        active &= (cur != dest) & ~changed
+    return changed
+
+
+def _history_row(label, i, j, change, dist, next_node, node_labels):
+    path = reconstruct_path(i, j, next_node)
+    return {
+        "Snapshot": label,
+        "From": node_labels[i],
+        "To": node_labels[j],
+        "Change": change,
+        "Path": "NO PATH" if path is None else " → ".join(node_labels[p] for p in path),
+        "Total Score": None if path is None else round(float(dist[i, j]), 2),
+    }
+
+
+def route_history(labels, results, node_labels, tol=1e-9):
+    """Compact per-pair history: only pairs whose route or score ever changes,
+    each with its first-snapshot state followed by one row per change."""
+    V = len(node_labels)
+    off_diag = ~np.eye(V, dtype=bool)
+    events = []
+
+    for k in range(1, len(results)):
+        _, prev_dist, prev_next = results[k - 1]
+        _, dist, next_node = results[k]
+
+        new_route = route_changed(prev_next, next_node) & off_diag
+        score_moved = np.abs(dist - prev_dist) > tol * (1 + np.abs(prev_dist))
+
+        for i, j in zip(*np.nonzero(new_route | (score_moved & off_diag))):
+            if next_node[i, j] < 0:
+                change = "route lost"
+            elif prev_next[i, j] < 0:
+                change = "route found"
+            elif new_route[i, j]:
+                change = "route changed"
+            else:
+                change = "score changed"
+            events.append((i, j, k, change))
+
+    _, first_dist, first_next = results[0]
+    rows = [_history_row(labels[0], i, j, "initial", first_dist, first_next, node_labels)
+            for i, j in sorted({(i, j) for i, j, _, _ in events})]
+    rows += [_history_row(labels[k], i, j, change, results[k][1], results[k][2], node_labels)
+             for i, j, k, change in events]
+
+    history = pd.DataFrame(rows, columns=["Snapshot", "From", "To", "Change", "Path", "Total Score"])
+    order = {label: n for n, label in enumerate(labels)}
+    return history.sort_values(
+        ["From", "To", "Snapshot"], key=lambda col: col.map(order) if col.name == "Snapshot" else col,
+        kind="stable"
+    ).reset_index(drop=True)
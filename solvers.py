@@ -0,0 +1,239 @@
+import importlib.util
+import json
+import os
+import time
+
+import numpy as np
+
+from pathfinding import NO_EDGE, NO_SUCCESSOR, as_successor_array, floydWarshall_with_path
+
+# Host-specific timings written by `python solvers.py calibrate`
+CALIBRATION_FILE = os.environ.get(
+    "GOLDPATH_CALIBRATION",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver_calibration.json")
+)
+
+# The pure-Python reference is only timed on graphs it can finish quickly
+REFERENCE_MAX_V = 150
+
+# Without a calibration table, smaller graphs skip numba (JIT compile time)
+NUMBA_MIN_V = 50
+
+
+# -----------------------------------------------------------
+# SOLVER CONTRACT
+# -----------------------------------------------------------
+# Every backend takes a (V, V) combined matrix (9999 = no lane), leaves it
+# untouched, and returns (dist, next_node):
+#   dist       float array, 9999 where j is unreachable from i
+#   next_node  int64 array, first hop on the route i → j, -1 if none
+SOLVERS = {}
+
+
+def register_solver(name):
+    def wrap(fn):
+        SOLVERS[name] = fn
+        return fn
+    return wrap
+
+
+def _to_inf(graph):
+    dist = np.array(graph, dtype=float)
+    dist[dist == NO_EDGE] = np.inf
+    np.fill_diagonal(dist, np.minimum(np.diag(dist), 0))
+    return dist
+
+
+def _initial_successors(dist):
+    V = len(dist)
+    nxt = np.where(np.isfinite(dist), np.arange(V)[None, :], NO_SUCCESSOR)
+    np.fill_diagonal(nxt, NO_SUCCESSOR)
+    return nxt.astype(np.int64)
+
+
+def _finish(dist, nxt):
+    dist[~np.isfinite(dist)] = NO_EDGE
+    return dist, nxt
+
+
+# -----------------------------------------------------------
+# BACKENDS
+# -----------------------------------------------------------
+@register_solver("reference")
+def solve_reference(graph):
+    """The original triple loop, run on a copy so the input is not mutated."""
+    dist, next_node = floydWarshall_with_path(np.asarray(graph, dtype=float).tolist())
+    return np.array(dist, dtype=float), as_successor_array(next_node)
+
+
+@register_solver("dense")
+def solve_dense(graph):
+    """Floyd–Warshall with each k step vectorized over the whole matrix."""
+    dist = _to_inf(graph)
+    nxt = _initial_successors(dist)
+    for k in range(len(dist)):
+        cand = dist[:, k, None] + dist[None, k, :]
+        better = cand < dist
+        dist[better] = cand[better]
+        nxt[better] = np.broadcast_to(nxt[:, k, None], nxt.shape)[better]
+    return _finish(dist, nxt)
+
+
+@register_solver("sparse")
+def solve_sparse(graph):
+    """One Dijkstra per destination on the reversed graph (scipy csgraph).
+
+    On the reversed graph the predecessor of i on the tree rooted at j is
+    exactly the first hop of the original route i → j.
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    graph = np.asarray(graph, dtype=float)
+    off_diag = ~np.eye(len(graph), dtype=bool)
+    if (graph[off_diag] < 0).any():
+        return solve_dense(graph)
+
+    src, dst = np.nonzero((graph != NO_EDGE) & off_diag)
+    reverse = csr_matrix((graph[src, dst], (dst, src)), shape=graph.shape)
+
+    dist_t, pred_t = dijkstra(reverse, directed=True, return_predecessors=True)
+    nxt = pred_t.T.astype(np.int64)
+    nxt[nxt < 0] = NO_SUCCESSOR
+    return _finish(np.ascontiguousarray(dist_t.T), nxt)
+
+
+_jit_kernel = None
+
+
+def _fw_kernel(dist, nxt):
+    V = dist.shape[0]
+    for k in range(V):
+        for i in range(V):
+            dik = dist[i, k]
+            if dik == np.inf:
+                continue
+            for j in range(V):
+                cand = dik + dist[k, j]
+                if cand < dist[i, j]:
+                    dist[i, j] = cand
+                    nxt[i, j] = nxt[i, k]
+
+
+# numba takes ~0.5 s to import, so only check that it exists here
+if importlib.util.find_spec("numba") is not None:
+    @register_solver("numba")
+    def solve_numba(graph):
+        """JIT-compiled triple loop (compiled on first use, cached on disk)."""
+        global _jit_kernel
+        if _jit_kernel is None:
+            import numba
+            _jit_kernel = numba.njit(cache=True)(_fw_kernel)
+        dist = _to_inf(graph)
+        nxt = _initial_successors(dist)
+        _jit_kernel(dist, nxt)
+        return _finish(dist, nxt)
+
+
+def get_solver(name):
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown solver backend '{name}'. Available: {', '.join(SOLVERS)}.")
+    return SOLVERS[name]
+
+
+# -----------------------------------------------------------
+# AUTOTUNING
+# -----------------------------------------------------------
+def lane_density(graph):
+    graph = np.asarray(graph)
+    V = len(graph)
+    if V < 2:
+        return 0.0
+    lanes = (graph != NO_EDGE).sum() - (np.diag(graph) != NO_EDGE).sum()
+    return float(lanes) / (V * (V - 1))
+
+
+def random_graph(V, density, rng):
+    graph = np.where(rng.random((V, V)) < density, rng.uniform(0.1, 10, (V, V)), float(NO_EDGE))
+    np.fill_diagonal(graph, 0)
+    return graph
+
+
+def calibrate(sizes=(25, 50, 100, 200, 400, 800), densities=(0.01, 0.05, 0.2, 0.6),
+              repeats=2, path=CALIBRATION_FILE, seed=0, log=print):
+    """Time every backend on synthetic graphs and persist the winners."""
+    rng = np.random.default_rng(seed)
+    if "numba" in SOLVERS:
+        SOLVERS["numba"](random_graph(4, 0.5, rng))  # exclude JIT compile time
+
+    table = []
+    for V in sizes:
+        for density in densities:
+            graph = random_graph(V, density, rng)
+            timings = {}
+            for name, solver in SOLVERS.items():
+                if name == "reference" and V > REFERENCE_MAX_V:
+                    continue
+                best = np.inf
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    solver(graph)
+                    best = min(best, time.perf_counter() - start)
+                timings[name] = best
+            winner = min(timings, key=timings.get)
+            table.append({"V": V, "density": density, "best": winner, "timings": timings})
+            log(f"V={V:5d} density={density:.2f} → {winner:9s} "
+                + " ".join(f"{n}={t:.4f}s" for n, t in timings.items()))
+
+    with open(path, "w") as f:
+        json.dump({"backends": list(SOLVERS), "table": table}, f, indent=2)
+    return table
+
+
+def load_calibration(path=CALIBRATION_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)["table"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def pick_solver(graph, table=None):
+    """Fastest backend for this graph according to the calibration table.
+
+    Uses the nearest calibrated (log V, log density) point whose winner is
+    available here; without a table falls back to a size/density heuristic.
+    """
+    V = len(graph)
+    density = max(lane_density(graph), 1e-4)
+    table = load_calibration() if table is None else table
+
+    candidates = [row for row in (table or []) if row["best"] in SOLVERS]
+    if candidates:
+        def distance(row):
+            return (np.log(row["V"] / max(V, 1)) ** 2
+                    + np.log(max(row["density"], 1e-4) / density) ** 2)
+        return min(candidates, key=distance)["best"]
+
+    if density < 0.1 and V > 100:
+        return "sparse"
+    # Small graphs are solved before numba's JIT compile would pay off
+    if V < NUMBA_MIN_V or "numba" not in SOLVERS:
+        return "dense"
+    return "numba"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shortest-path solver backends")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="time each backend on this machine")
+    cal.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200, 400, 800])
+    cal.add_argument("--densities", type=float, nargs="+", default=[0.01, 0.05, 0.2, 0.6])
+    cal.add_argument("--repeats", type=int, default=2)
+    cal.add_argument("--output", default=CALIBRATION_FILE)
+    args = parser.parse_args()
+
+    calibrate(args.sizes, args.densities, args.repeats, args.output)
+    print(f"Saved selection table to {args.output}")
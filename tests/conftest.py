@@ -0,0 +1,72 @@
+"""Shared fixtures: random networks and checks against the reference Floyd–Warshall."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pathfinding import NO_EDGE, as_successor_array, floydWarshall_with_path, reconstruct_path  # noqa: E402
+
+# (nodes, lane density) pairs: sparse ones split into many components
+SHAPES = [(1, 0.5), (2, 0.5), (5, 0.3), (8, 0.15), (12, 0.1), (15, 0.3), (20, 0.05), (25, 0.6)]
+
+
+def random_graph(V, density, rng, zero_share=0.1):
+    """Combined matrix with 9999 for missing lanes and some zero / repeated weights."""
+    weights = rng.choice([0.0, 1.0, 2.5], size=(V, V))
+    weights = np.where(rng.random((V, V)) < zero_share, weights, rng.uniform(0.1, 10, (V, V)).round(1))
+    graph = np.where(rng.random((V, V)) < density, weights, float(NO_EDGE))
+    np.fill_diagonal(graph, 0)
+    return graph
+
+
+def random_criteria(V, density, rng):
+    """Time / cost / risk matrices where some lanes lack one criterion."""
+    lanes = rng.random((V, V)) < density
+    graphs = []
+    for _ in range(3):
+        g = np.where(lanes & (rng.random((V, V)) > 0.1), rng.integers(1, 6, (V, V)).astype(float), float(NO_EDGE))
+        np.fill_diagonal(g, 0)
+        graphs.append(g)
+    return tuple(graphs)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(20240301)
+
+
+@pytest.fixture
+def reference():
+    def solve(graph):
+        dist, next_node = floydWarshall_with_path(np.array(graph, dtype=float))
+        return np.asarray(dist, dtype=float), as_successor_array(next_node)
+    return solve
+
+
+@pytest.fixture
+def assert_matches_reference(reference):
+    """Distances equal the reference; every successor route exists and costs its distance.
+
+    Routes themselves are not compared, since ties may be broken differently.
+    """
+    def check(graph, dist, next_node):
+        graph = np.asarray(graph, dtype=float)
+        expected, expected_next = reference(graph)
+        np.testing.assert_allclose(np.asarray(dist, dtype=float), expected, atol=1e-9)
+
+        next_node = as_successor_array(next_node)
+        V = len(graph)
+        off_diag = ~np.eye(V, dtype=bool)
+        assert ((next_node >= 0) == (expected_next >= 0))[off_diag].all()
+
+        for i, j in zip(*np.nonzero((next_node >= 0) & off_diag)):
+            path = reconstruct_path(i, j, next_node)
+            assert path[0] == i and path[-1] == j and len(path) <= V
+            lanes = graph[path[:-1], path[1:]]
+            assert (lanes != NO_EDGE).all()
+            assert lanes.sum() == pytest.approx(expected[i, j])
+    return check
@@ -0,0 +1,51 @@
+"""Lane closures must match re-solving the network without the lane."""
+import numpy as np
+import pytest
+
+from conftest import random_graph
+from contingency import contingency_analysis, critical_lanes
+from pathfinding import NO_EDGE, combine_weights
+from pruning import prune_dominated
+
+NODES = ["A", "B", "C"]
+
+
+@pytest.mark.parametrize("V, density", [(5, 0.4), (10, 0.25), (16, 0.15)])
+def test_matches_resolving_without_lane(V, density, rng, reference):
+    graph = random_graph(V, density, rng)
+    dist, next_node = reference(graph)
+    base = np.where(dist == NO_EDGE, np.inf, dist)
+
+    results = {lane: rest for lane, *rest in contingency_analysis(graph, dist, next_node, max_workers=1)}
+    routed = {(i, int(next_node[i, j])) for i, j in zip(*np.nonzero(next_node >= 0))}
+    assert set(results) == routed
+
+    for (u, v), (dests, sources, before, after) in results.items():
+        closed = graph.copy()
+        closed[u, v] = NO_EDGE
+        expected = reference(closed)[0]
+        expected = np.where(expected == NO_EDGE, np.inf, expected)
+
+        worse = set(zip(*np.nonzero(expected > base + 1e-9)))
+        assert set(zip(sources.tolist(), dests.tolist())) == worse
+        np.testing.assert_allclose(after, expected[sources, dests])
+        np.testing.assert_allclose(before, base[sources, dests])
+
+
+def test_pruned_lane_is_the_fallback(reference):
+    # A→B→C (1 + 1) dominates A→C (3), but A→C is what remains once A→B closes
+    g = np.array([[0, 1, 3], [NO_EDGE, 0, 1], [NO_EDGE, NO_EDGE, 0]], dtype=float)
+    weights = (1 / 3, 1 / 3, 1 / 3)
+    pruned = prune_dominated(g, g, g)
+    assert pruned[3] == 1
+
+    # Routes come from the pruned solve; closures run on the full graph
+    dist, next_node = reference(combine_weights(*pruned[:3], *weights))
+    full = combine_weights(g, g, g, *weights)
+    report = critical_lanes(contingency_analysis(full, dist, next_node, max_workers=1), next_node, NODES)
+
+    lane = report[(report["From"] == "A") & (report["To"] == "B")].iloc[0]
+    assert lane["Pairs Disconnected"] == 1  # only A→B itself
+    assert lane["Pairs Degraded"] == 1
+    assert lane["Worst Pair"] == "A → C"
+    assert lane["Worst Score Increase"] == pytest.approx(1.0)
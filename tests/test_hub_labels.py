@@ -0,0 +1,48 @@
+"""Hub-label queries must match the reference; old index files are evicted."""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_graph
+from hub_labels import HubLabelIndex, dense_to_csr, dijkstra_route, evict_old_indexes, load_or_build
+from pathfinding import NO_EDGE
+
+
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_queries_match_reference(V, density, rng, reference, tmp_path):
+    graph = random_graph(V, density, rng)
+    expected, _ = reference(graph)
+
+    index_csr = dense_to_csr(graph)
+    index, built = load_or_build(index_csr, directory=tmp_path)
+    assert built
+    index = HubLabelIndex.load(next(tmp_path.iterdir()))
+
+    for s in range(V):
+        for t in range(V):
+            route = index.route(s, t)
+            direct = dijkstra_route(index_csr, s, t)
+            if expected[s, t] == NO_EDGE:
+                assert route is None and direct is None and not np.isfinite(index.distance(s, t))
+                continue
+            assert index.distance(s, t) == pytest.approx(expected[s, t])
+            for path in (route, direct):
+                assert path[0] == s and path[-1] == t
+                assert graph[path[:-1], path[1:]].sum() == pytest.approx(expected[s, t])
+
+
+def test_reuses_saved_index(rng, tmp_path):
+    csr = dense_to_csr(random_graph(10, 0.3, rng))
+    assert load_or_build(csr, directory=tmp_path)[1]
+    assert not load_or_build(csr, directory=tmp_path)[1]
+
+
+def test_keeps_only_recent_indexes(rng, tmp_path):
+    for k in range(5):
+        load_or_build(dense_to_csr(random_graph(6, 0.4, rng)), directory=tmp_path, keep=3)
+        newest = max(tmp_path.iterdir(), key=os.path.getmtime)
+        os.utime(newest, (k, k))  # distinct, increasing use times
+    assert len(list(tmp_path.iterdir())) == 3
+
+    assert evict_old_indexes(tmp_path, keep=1) and len(list(tmp_path.iterdir())) == 1
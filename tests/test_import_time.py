@@ -0,0 +1,80 @@
+"""Cold-start budget for app.py's top-level imports (measured with -X importtime)."""
+import ast
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load on the code path that needs them
+# (pyarrow is left out: recent pandas imports it whenever it is installed)
+HEAVY = {"graphviz", "matplotlib", "networkx", "scipy", "numba", "cairosvg", "openpyxl"}
+
+# Budgets in milliseconds, overridable for slow CI hosts
+THIRD_PARTY_BUDGET_MS = float(os.environ.get("GOLDPATH_THIRD_PARTY_IMPORT_MS", 2500))
+PROJECT_BUDGET_MS = float(os.environ.get("GOLDPATH_PROJECT_IMPORT_MS", 150))
+
+
+def app_imports():
+    with open(os.path.join(ROOT, "app.py")) as f:
+        tree = ast.parse(f.read())
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            names.append(node.module)
+    return names
+
+
+def is_project(name):
+    return os.path.exists(os.path.join(ROOT, name.split(".")[0] + ".py"))
+
+
+def importtime(modules):
+    """Run one interpreter importing ``modules`` in order; return {name: cumulative_us}."""
+    code = "; ".join(f"import {m}" for m in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def timings():
+    pytest.importorskip("streamlit")
+    modules = app_imports()
+    third_party = [m for m in modules if not is_project(m)]
+    project = [m for m in modules if is_project(m)]
+    return third_party, project, importtime(third_party + project)
+
+
+def test_no_heavy_modules_at_startup(timings):
+    _, _, cumulative = timings
+    loaded = {name.split(".")[0] for name in cumulative}
+    assert not loaded & HEAVY, f"imported at startup: {sorted(loaded & HEAVY)}"
+
+
+def test_third_party_import_budget(timings):
+    third_party, _, cumulative = timings
+    total_ms = sum(cumulative.get(m, 0) for m in third_party) / 1000
+    assert total_ms < THIRD_PARTY_BUDGET_MS, f"{total_ms:.0f} ms"
+
+
+def test_project_import_budget(timings):
+    # Third-party modules are imported first, so these only count our own code
+    _, project, cumulative = timings
+    total_ms = sum(cumulative.get(m, 0) for m in project) / 1000
+    assert total_ms < PROJECT_BUDGET_MS, f"{total_ms:.0f} ms"
@@ -0,0 +1,140 @@
+"""Every input format must produce the same graphs as the Excel workbook."""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from hub_labels import dense_to_csr
+from ingest import (
+    CRITERIA,
+    EdgeListGraph,
+    matrices_to_graphs,
+    read_edge_list,
+    read_excel_matrices,
+    read_matrix_csv,
+    read_matrix_files,
+    read_matrix_parquet,
+)
+from pathfinding import NO_EDGE, combine_weights, compute_path_totals, reconstruct_path
+
+WORKBOOK = os.path.join(ROOT, "GoldMatrices.xlsx")
+
+
+@pytest.fixture(scope="module")
+def workbook():
+    return read_excel_matrices(WORKBOOK)
+
+
+def csv_buffer(df):
+    return io.StringIO(df.to_csv())
+
+
+def parquet_buffer(df):
+    pytest.importorskip("pyarrow")
+    buf = io.BytesIO()
+    df.to_parquet(buf)
+    buf.seek(0)
+    return buf
+
+
+def assert_same_graphs(dfs, expected):
+    for df, exp in zip(dfs, expected):
+        assert list(df.index) == [str(x) for x in exp.index]
+        assert list(df.columns) == [str(x) for x in exp.columns]
+    for got, exp in zip(matrices_to_graphs(*dfs), matrices_to_graphs(*expected)):
+        np.testing.assert_allclose(got, exp)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 5, 256])
+@pytest.mark.parametrize("to_buffer, reader", [(csv_buffer, read_matrix_csv),
+                                               (parquet_buffer, read_matrix_parquet)])
+def test_matrix_files_match_workbook(workbook, to_buffer, reader, chunk_rows):
+    dfs = read_matrix_files(
+        *(to_buffer(df) for df in workbook),
+        reader=lambda f, name: reader(f, name, chunk_rows=chunk_rows)
+    )
+    assert_same_graphs(dfs, workbook)
+
+
+def test_missing_cells_become_no_edge():
+    df = pd.DataFrame([[0, np.nan], [2.5, 0]], index=["A", "B"], columns=["A", "B"])
+    graph = matrices_to_graphs(*(read_matrix_csv(csv_buffer(df), name, chunk_rows=1) for name in CRITERIA))[0]
+    np.testing.assert_array_equal(graph, [[0, NO_EDGE], [2.5, 0]])
+
+
+@pytest.mark.parametrize("reader, to_buffer", [(read_matrix_csv, csv_buffer),
+                                               (read_matrix_parquet, parquet_buffer)])
+@pytest.mark.parametrize("shape", [(2, 3), (3, 2)])
+def test_non_square_rejected(reader, to_buffer, shape):
+    rows, cols = shape
+    df = pd.DataFrame(np.ones(shape), index=list("ABC")[:rows], columns=list("ABC")[:cols])
+    with pytest.raises(ValueError, match="Cost matrix is not square"):
+        reader(to_buffer(df), "Cost", chunk_rows=2)
+
+
+def test_label_mismatch_rejected(workbook):
+    time_df, cost_df, risk_df = workbook
+    cost_df = cost_df.rename(index={cost_df.index[0]: "Elsewhere"})
+    with pytest.raises(ValueError, match="labels do not match"):
+        read_matrix_files(*(csv_buffer(df) for df in (time_df, cost_df, risk_df)), reader=read_matrix_csv)
+
+
+# -----------------------------------------------------------
+# EDGE LISTS
+# -----------------------------------------------------------
+def edge_csv(text):
+    return io.StringIO(text)
+
+
+def test_edge_list_maps_missing_values():
+    graph = read_edge_list(edge_csv(
+        "from,to,time,cost,risk\n"
+        "A,B,1,2,\n"
+        "B,C,,3,4\n"
+        "D,D,,,\n"
+    ), chunk_rows=2)
+    assert graph.labels == ["A", "B", "C", "D"]
+    assert list(zip(graph.src, graph.dst)) == [(0, 1), (1, 2)]
+    np.testing.assert_array_equal(graph.time, [1, NO_EDGE])
+    np.testing.assert_array_equal(graph.risk, [NO_EDGE, 4])
+
+
+def test_edge_list_duplicate_lanes_rejected():
+    with pytest.raises(ValueError, match="duplicate lanes"):
+        read_edge_list(edge_csv("from,to,time,cost,risk\nA,B,1,1,1\nC,D,1,1,1\nA,B,2,2,2\n"), chunk_rows=2)
+
+
+def test_edge_list_missing_columns_rejected():
+    with pytest.raises(ValueError, match="missing columns: risk"):
+        read_edge_list(edge_csv("from,to,time,cost\nA,B,1,1\n"))
+
+
+@pytest.mark.parametrize("weights", [(1 / 3, 1 / 3, 1 / 3), (1, 0, 0), (0, 0.5, 0.5)])
+def test_edge_list_matches_dense(workbook, weights):
+    graphs = matrices_to_graphs(*workbook)
+    graphs[1][0, 1] = 4.0  # a lane with cost but no time or risk
+    edge_graph = EdgeListGraph.from_dense(list(workbook[0].index), *graphs)
+
+    expected = dense_to_csr(combine_weights(*graphs, *weights))
+    got = edge_graph.combined_csr(*weights)
+    assert (got != expected).nnz == 0 and got.nnz == expected.nnz
+
+    for dense, back in zip(graphs, edge_graph.to_dense()):
+        np.testing.assert_array_equal(back, dense)
+
+
+def test_edge_list_path_totals_match_dense(workbook, reference):
+    graphs = matrices_to_graphs(*workbook)
+    edge_graph = EdgeListGraph.from_dense(list(workbook[0].index), *graphs)
+    weights = (0.5, 0.3, 0.2)
+    _, next_node = reference(combine_weights(*graphs, *weights))
+
+    routes = [reconstruct_path(i, j, next_node) for i, j in zip(*np.nonzero(next_node >= 0))]
+    assert any(len(path) > 2 for path in routes)
+    for path in routes + [[0]]:
+        assert edge_graph.path_totals(path, *weights) == pytest.approx(
+            compute_path_totals(path, *graphs, *weights)
+        )
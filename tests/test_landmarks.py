@@ -0,0 +1,57 @@
+"""Landmark bounds must always bracket the exact distance."""
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_graph
+from hub_labels import dense_to_csr
+from landmarks import LandmarkIndex, approximation_error
+from pathfinding import NO_EDGE
+
+
+def exact_distances(graph, reference):
+    dist, _ = reference(graph)
+    return np.where(dist == NO_EDGE, np.inf, dist)
+
+
+def all_bounds(index, V):
+    s, t = np.indices((V, V))
+    lower, upper = index.bounds(s.ravel(), t.ravel())
+    return lower.reshape(V, V), upper.reshape(V, V)
+
+
+@pytest.mark.parametrize("method", ["degree", "random"])
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_bounds_bracket_exact(V, density, method, rng, reference):
+    for n_landmarks in (1, 3):
+        graph = random_graph(V, density, rng)
+        exact = exact_distances(graph, reference)
+        index = LandmarkIndex.build(dense_to_csr(graph), n_landmarks, method, max_workers=1)
+        lower, upper = all_bounds(index, V)
+
+        assert (lower <= exact + 1e-9).all()
+        assert (exact <= upper + 1e-9).all()
+        # An infinite lower bound is a proof that no route exists
+        assert not np.isfinite(exact[~np.isfinite(lower)]).any()
+
+
+def test_every_node_a_landmark_is_exact(rng, reference):
+    V = 15
+    graph = random_graph(V, 0.1, rng)
+    exact = exact_distances(graph, reference)
+    assert not np.isfinite(exact).all()
+
+    index = LandmarkIndex.build(dense_to_csr(graph), V, max_workers=2, batch=4)
+    lower, upper = all_bounds(index, V)
+    np.testing.assert_allclose(upper, exact)
+    assert not np.isfinite(lower[~np.isfinite(exact)]).any()  # all unreachable pairs detected
+
+
+def test_error_report_is_chunk_independent(rng):
+    csr = dense_to_csr(random_graph(40, 0.06, rng))
+    index = LandmarkIndex.build(csr, 4, max_workers=1)
+    whole = approximation_error(index, csr, n_pairs=300, chunk=1000)
+    chunked = approximation_error(index, csr, n_pairs=300, chunk=3)
+    assert whole.keys() == chunked.keys()
+    for key in whole:
+        assert whole[key] == pytest.approx(chunked[key], nan_ok=True)
+    assert whole["Reachable"] > 0 and 0 <= whole["Mean Upper Error"]
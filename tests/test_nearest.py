@@ -0,0 +1,57 @@
+"""Nearest-target queries must agree with the all-pairs reference."""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SHAPES, random_graph
+from hub_labels import dense_to_csr
+from nearest import nearest_targets, read_targets
+from pathfinding import NO_EDGE, NO_SUCCESSOR
+
+
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_matches_min_over_targets(V, density, rng, reference):
+    for _ in range(3):
+        graph = random_graph(V, density, rng)
+        targets = rng.choice(V, size=int(rng.integers(1, V + 1)), replace=False)
+        expected, _ = reference(graph)
+        expected = np.where(expected == NO_EDGE, np.inf, expected)[:, targets].min(axis=1)
+
+        dist, next_hop, target = nearest_targets(dense_to_csr(graph), targets)
+        np.testing.assert_allclose(dist, expected, atol=1e-9)
+
+        for v in range(V):
+            if not np.isfinite(expected[v]):
+                assert target[v] == NO_SUCCESSOR and next_hop[v] == NO_SUCCESSOR
+                continue
+            assert target[v] in targets
+            path = [v]
+            while path[-1] != target[v]:
+                path.append(int(next_hop[path[-1]]))
+                assert len(path) <= V
+            assert graph[path[:-1], path[1:]].sum() == pytest.approx(expected[v])
+
+
+def targets_workbook(rows):
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name="Targets", index=False)
+    buf.seek(0)
+    return buf
+
+
+def test_read_targets_groups_by_type():
+    groups = read_targets(targets_workbook({"Node": ["B", "C", "A"], "Type": ["Vault", "Port", "Vault"]}),
+                          ["A", "B", "C"])
+    assert groups == {"Vault": [1, 0], "Port": [2]}
+
+
+@pytest.mark.parametrize("rows, message", [
+    ({"Node": ["Z"], "Type": ["Vault"]}, "unknown node 'Z'"),
+    ({"Hub": ["A"]}, "must have a 'Node' column"),
+])
+def test_read_targets_rejects_bad_sheets(rows, message):
+    with pytest.raises(ValueError, match=message):
+        read_targets(targets_workbook(rows), ["A", "B", "C"])
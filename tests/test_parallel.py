@@ -0,0 +1,18 @@
+"""pool_map gives the same answers inline and across processes."""
+import pytest
+
+from parallel import pool_map, shared
+
+
+def scaled(x):
+    return x * shared["factor"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_shared_data_reaches_workers(max_workers):
+    assert pool_map(scaled, range(5), shared_data={"factor": 3}, max_workers=max_workers) == [0, 3, 6, 9, 12]
+    assert shared == {}
+
+
+def test_no_jobs():
+    assert pool_map(scaled, []) == []
@@ -0,0 +1,35 @@
+"""Pruning dominated lanes must leave every shortest distance unchanged."""
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_criteria
+from pathfinding import NO_EDGE, combine_weights
+from pruning import prune_dominated
+
+WEIGHTS = [(1 / 3, 1 / 3, 1 / 3), (1, 0, 0), (0, 0.5, 0.5), (0.2, 0.7, 0.1)]
+
+
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_distances_unchanged(V, density, rng, reference, assert_matches_reference):
+    for _ in range(5):
+        graphs = random_criteria(V, density, rng)
+        pruned = prune_dominated(*graphs)[:3]
+        for w in WEIGHTS:
+            full_dist, _ = reference(combine_weights(*graphs, *w))
+            pruned_graph = combine_weights(*pruned, *w)
+            dist, next_node = reference(pruned_graph)
+            np.testing.assert_allclose(dist, full_dist, atol=1e-9)
+            assert_matches_reference(pruned_graph, dist, next_node)
+
+
+def test_two_hop_detour_pruned():
+    # A→C (3) is beaten by A→B→C (1 + 1) on every criterion
+    g = np.array([[0, 1, 3], [NO_EDGE, 0, 1], [NO_EDGE, NO_EDGE, 0]], dtype=float)
+    t, c, r, removed = prune_dominated(g, g, g)
+    assert removed == 1
+    assert t[0, 2] == c[0, 2] == r[0, 2] == NO_EDGE
+
+
+def test_negative_values_disable_pruning():
+    g = np.array([[0, -1, 3], [NO_EDGE, 0, 1], [NO_EDGE, NO_EDGE, 0]], dtype=float)
+    assert prune_dominated(g, g, g)[3] == 0
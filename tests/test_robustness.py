@@ -0,0 +1,74 @@
+"""Batched Monte-Carlo statistics must match solving every sample on its own."""
+import numpy as np
+import pytest
+
+from conftest import random_criteria
+from pathfinding import NO_EDGE, combine_weights, compute_path_totals, reconstruct_path
+from robustness import (
+    MEMORY_BUDGET,
+    PERCENTILE_BINS,
+    TOTALS,
+    monte_carlo_robustness,
+    sample_chunk,
+    weight_bounds,
+)
+
+WEIGHTS = (0.5, 0.3, 0.2)
+QS = (0.05, 0.5, 0.95)
+
+
+def with_missing(graphs, values):
+    out = [np.where(g == NO_EDGE, NO_EDGE, x) for g, x in zip(graphs, values)]
+    for g in out:
+        np.fill_diagonal(g, 0)
+    return out
+
+
+@pytest.mark.parametrize("V, pct", [(6, 0.1), (9, 0.3)])
+def test_matches_per_sample_solves(V, pct, rng, reference):
+    graphs = random_criteria(V, 0.4, rng)
+    _, next_node = reference(combine_weights(*graphs, *WEIGHTS))
+    routes = {(i, j): reconstruct_path(i, j, next_node) for i, j in zip(*np.nonzero(next_node >= 0))}
+    assert routes
+    n_samples = 300
+
+    win_rate, percentiles = monte_carlo_robustness(
+        graphs, WEIGHTS, next_node, n_samples=n_samples, pct=pct, chunk=n_samples, seed=7, qs=QS
+    )
+
+    # Same draws as one chunk, each sample solved with the reference
+    bounds = weight_bounds(graphs, pct=pct)
+    draws = np.random.default_rng(7)
+    samples = [draws.uniform(lo, hi, size=(n_samples, V, V)) for lo, hi in bounds]
+    wins = {pair: 0 for pair in routes}
+    totals = {pair: [] for pair in routes}
+    for s in range(n_samples):
+        sampled = with_missing(graphs, [x[s] for x in samples])
+        best, _ = reference(combine_weights(*sampled, *WEIGHTS))
+        for (i, j), path in routes.items():
+            t = compute_path_totals(path, *sampled, *WEIGHTS)
+            totals[i, j].append(t)
+            wins[i, j] += t[0] <= best[i, j] + 1e-9
+
+    low = with_missing(graphs, [b[0] for b in bounds])
+    high = with_missing(graphs, [b[1] for b in bounds])
+    for (i, j), path in routes.items():
+        assert win_rate[i, j] == pytest.approx(wins[i, j] / n_samples)
+
+        # Percentiles come from fixed bins between the all-low and all-high totals
+        width = (np.array(compute_path_totals(path, *high, *WEIGHTS))
+                 - np.array(compute_path_totals(path, *low, *WEIGHTS))) / PERCENTILE_BINS
+        values = np.array(totals[i, j])
+        for k, name in enumerate(TOTALS):
+            for q, p in zip(QS, percentiles[name]):
+                assert p[i, j] == pytest.approx(np.percentile(values[:, k], q * 100), abs=width[k] + 1e-9)
+
+    unrouted = next_node < 0
+    assert np.isnan(win_rate[unrouted]).all()
+    assert np.isnan(percentiles["Score"][1][unrouted]).all()
+
+
+def test_chunk_fits_memory_budget():
+    assert sample_chunk(10) == 64
+    assert 1 < sample_chunk(300) and sample_chunk(300) * 9 * 8 * 300 ** 2 <= MEMORY_BUDGET
+    assert sample_chunk(5000) == 1
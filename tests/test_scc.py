@@ -0,0 +1,23 @@
+"""solve_by_components must reproduce the single all-pairs solve."""
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_graph
+from pathfinding import NO_EDGE
+from scc import condense, solve_by_components
+
+
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_matches_reference(V, density, rng, assert_matches_reference):
+    for _ in range(5):
+        graph = random_graph(V, density, rng)
+        dist, next_node = solve_by_components(graph.copy())
+        assert_matches_reference(graph, dist, next_node)
+
+
+def test_unreachable_pairs_counted(rng, reference):
+    for V, density in SHAPES:
+        graph = random_graph(V, density, rng)
+        dist, _ = reference(graph)
+        off_diag = ~np.eye(V, dtype=bool)
+        assert condense(graph).unreachable_pairs() == int((dist[off_diag] == NO_EDGE).sum())
@@ -0,0 +1,71 @@
+"""Snapshot ordering, and warm starts that must equal cold solves."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import random_criteria
+from pathfinding import NO_EDGE
+from snapshots import Snapshot, _sort_key, read_snapshot_workbook, solve_parallel, solve_warm
+
+WEIGHTS = (1 / 3, 1 / 3, 1 / 3)
+
+
+@pytest.mark.parametrize("labels", [
+    ["week9", "week10", "week11"],
+    ["2", "10", "100"],
+    ["risk-2024W9", "risk-2024W10", "risk-2025W1"],
+    ["2024-02-15", "2024-03-01", "2024-12-31", "week2", "week12"],
+])
+def test_natural_order(labels):
+    assert sorted(reversed(labels), key=_sort_key) == labels
+
+
+def test_workbook_sheets_in_week_order(tmp_path):
+    nodes = ["A", "B"]
+    path = tmp_path / "weekly.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        for week in (10, 9, 11):
+            df = pd.DataFrame([[0, week], [NO_EDGE, 0]], index=nodes, columns=nodes)
+            for criterion in ("Time", "Cost", "Risk"):
+                df.to_excel(writer, sheet_name=f"{criterion} week{week}")
+
+    snapshots = read_snapshot_workbook(path)
+    assert [s.label for s in snapshots] == ["week9", "week10", "week11"]
+    assert [s.time[0, 1] for s in snapshots] == [9, 10, 11]
+
+
+def weekly_changes(V, n_weeks, rng):
+    """Snapshots where each week raises, lowers, closes or opens a few lanes."""
+    graphs = [np.array(g) for g in random_criteria(V, 0.3, rng)]
+    snapshots = []
+    for week in range(n_weeks):
+        snapshots.append(Snapshot(f"week{week}", list(range(V)), *(g.copy() for g in graphs)))
+        for _ in range(int(rng.integers(1, 4))):
+            i, j = rng.choice(V, 2, replace=False)
+            kind = rng.integers(4)
+            for g in graphs:
+                if kind == 0 and g[i, j] != NO_EDGE:
+                    g[i, j] += rng.integers(1, 5)
+                elif kind == 1 and g[i, j] != NO_EDGE:
+                    g[i, j] = max(g[i, j] - rng.integers(1, 5), 0)
+                elif kind == 2:
+                    g[i, j] = NO_EDGE
+                else:
+                    g[i, j] = rng.integers(1, 6)
+    return snapshots
+
+
+@pytest.mark.parametrize("V", [12, 20, 30])
+def test_warm_start_equals_cold_solve(V, rng, assert_matches_reference):
+    used_warm = False
+    for _ in range(4):
+        snapshots = weekly_changes(V, 6, rng)
+        warm, how = solve_warm(snapshots, WEIGHTS, "dense")
+        cold, _ = solve_parallel(snapshots, WEIGHTS, "reference", max_workers=1)
+
+        for (graph, dist, next_node), (cold_graph, cold_dist, _) in zip(warm, cold):
+            np.testing.assert_array_equal(graph, cold_graph)
+            np.testing.assert_allclose(dist, cold_dist, atol=1e-9)
+            assert_matches_reference(graph, dist, next_node)
+        used_warm |= any(note.startswith("warm") for note in how)
+    assert used_warm
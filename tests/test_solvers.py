@@ -0,0 +1,58 @@
+"""Every registered backend must honour the reference solver's contract."""
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_graph
+from scc import condense, solve_by_components
+from solvers import NUMBA_MIN_V, SOLVERS, get_solver, pick_solver
+
+
+@pytest.mark.parametrize("name", list(SOLVERS))
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_backend_matches_reference(name, V, density, rng, assert_matches_reference):
+    for _ in range(3):
+        graph = random_graph(V, density, rng)
+        dist, next_node = get_solver(name)(graph.copy())
+        assert_matches_reference(graph, dist, next_node)
+
+
+def test_backend_leaves_input_untouched(rng):
+    graph = random_graph(12, 0.3, rng)
+    for name in SOLVERS:
+        g = graph.copy()
+        get_solver(name)(g)
+        np.testing.assert_array_equal(g, graph, err_msg=name)
+
+
+def test_component_selector_sees_component_submatrices(rng, assert_matches_reference):
+    graph = random_graph(25, 0.08, rng)
+    condensation = condense(graph)
+    sizes = []
+
+    def select(sub):
+        sizes.append(len(sub))
+        return get_solver(pick_solver(sub, []))
+
+    dist, next_node = solve_by_components(graph, condensation=condensation, select=select)
+    component_sizes = np.bincount(condensation.labels)
+    # Single-node components are filled in without calling a solver
+    assert sizes and sorted(sizes) == sorted(component_sizes[component_sizes > 1])
+    assert (component_sizes == 1).any()
+    assert_matches_reference(graph, dist, next_node)
+
+
+def test_uncalibrated_small_graphs_skip_numba(rng):
+    assert pick_solver(random_graph(2, 1.0, rng), []) == "dense"
+    assert pick_solver(random_graph(NUMBA_MIN_V - 1, 0.5, rng), []) == "dense"
+    large = pick_solver(random_graph(NUMBA_MIN_V, 0.5, rng), [])
+    assert large == ("numba" if "numba" in SOLVERS else "dense")
+
+
+def test_pick_solver_uses_nearest_calibration_point():
+    table = [{"V": 25, "density": 0.6, "best": "dense"},
+             {"V": 800, "density": 0.01, "best": "sparse"}]
+    small = np.zeros((20, 20))
+    large = np.full((900, 900), 9999.0)
+    large[np.arange(899), np.arange(1, 900)] = 1
+    assert pick_solver(small, table) == "dense"
+    assert pick_solver(large, table) == "sparse"
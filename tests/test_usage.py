@@ -0,0 +1,56 @@
+"""route_usage must agree with expanding every route."""
+import time
+
+import numpy as np
+import pytest
+
+from conftest import SHAPES, random_graph
+from pathfinding import NO_SUCCESSOR, reconstruct_path
+from usage import route_usage
+
+
+def expanded_usage(next_node):
+    V = len(next_node)
+    edge_use = np.zeros((V, V), dtype=np.int64)
+    node_use = np.zeros(V, dtype=np.int64)
+    for i in range(V):
+        for j in range(V):
+            path = reconstruct_path(i, j, next_node) if i != j else None
+            if path is None:
+                continue
+            for a, b in zip(path[:-1], path[1:]):
+                edge_use[a, b] += 1
+            node_use[path[1:-1]] += 1
+    return edge_use, node_use
+
+
+@pytest.mark.parametrize("V, density", SHAPES)
+def test_matches_expanded_routes(V, density, rng, reference):
+    for _ in range(5):
+        _, next_node = reference(random_graph(V, density, rng))
+        edge_use, node_use = route_usage(next_node)
+        expected_edges, expected_nodes = expanded_usage(next_node)
+        np.testing.assert_array_equal(edge_use, expected_edges)
+        np.testing.assert_array_equal(node_use, expected_nodes)
+
+
+def chain_successors(V):
+    # 0 → 1 → ... → V-1: every route to j walks the chain, depth up to V
+    rows, dest = np.indices((V, V))
+    return np.where(rows < dest, rows + 1, NO_SUCCESSOR)
+
+
+def test_chain_scales_quadratically():
+    def timed(V):
+        start = time.perf_counter()
+        route_usage(chain_successors(V))
+        return time.perf_counter() - start
+
+    timed(100)
+    small, large = timed(400), timed(1600)
+    # 16x the work for a 4x longer chain; a per-hop walk would be 64x
+    assert large < 40 * max(small, 1e-3)
+
+    edge_use, node_use = route_usage(chain_successors(6))
+    assert edge_use[2, 3] == 3 * 3
+    assert list(node_use) == [0, 4, 6, 6, 4, 0]
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from pathfinding import as_successor_array
+
+
+# -----------------------------------------------------------
+# LANE / HUB USAGE FROM THE SUCCESSOR TREES
+# -----------------------------------------------------------
+def route_usage(next_node):
+    """Count how many chosen routes use each lane and pass through each hub.
+
+    For a fixed destination j, ``next_node[:, j]`` is an in-tree rooted at j,
+    so the number of routes using lane (v → next[v][j]) is the size of v's
+    subtree. Subtree sizes are accumulated leaves-first by peeling the trees
+    with child counts (Kahn's algorithm), all destinations at once: each
+    (node, destination) pair is visited once, O(V²) in total.
+
+    Returns ``(edge_use, node_use)``: a (V, V) lane count matrix and, per
+    node, the number of routes that pass through it as an intermediate hop.
+    """
+    nxt = as_successor_array(next_node)
+    V = len(nxt)
+    rows, dest = np.indices((V, V))
+    routed = (nxt >= 0) & (rows != dest)
+
+    # children[v, j]: routed nodes whose next hop towards j is v
+    children = np.zeros((V, V), dtype=np.int64)
+    np.add.at(children, (nxt[routed], dest[routed]), 1)
+
+    size = routed.astype(np.int64)
+    edge_use = np.zeros((V, V), dtype=np.int64)
+
+    frontier = np.flatnonzero(routed & (children == 0))
+    while len(frontier):
+        i, j = np.divmod(frontier, V)
+        p = nxt[i, j]
+        np.add.at(edge_use, (i, p), size[i, j])
+
+        inner = p != j
+        i, j, p = i[inner], j[inner], p[inner]
+        np.add.at(size, (p, j), size[i, j])
+        np.add.at(children, (p, j), -1)
+
+        parents = np.unique(p * V + j)
+        frontier = parents[children.ravel()[parents] == 0]
+
+    node_use = (size - routed).sum(axis=1)
+    return edge_use, node_use
+
+
+def usage_tables(edge_use, node_use, node_labels, top=None):
+    """Ranked lane and hub tables (most used first)."""
+    i, j = np.nonzero(edge_use)
+    lanes = pd.DataFrame({
+        "From": [node_labels[a] for a in i],
+        "To": [node_labels[b] for b in j],
+        "Routes Using Lane": edge_use[i, j],
+    }).sort_values("Routes Using Lane", ascending=False, kind="stable")
+
+    hubs = pd.DataFrame({
+        "Hub": list(node_labels),
+        "Routes Through Hub": node_use,
+    }).sort_values("Routes Through Hub", ascending=False, kind="stable")
+
+    if top is not None:
+        lanes, hubs = lanes.head(top), hubs.head(top)
+    return lanes.reset_index(drop=True), hubs.reset_index(drop=True)